@@ -0,0 +1,297 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from module_test_parsing import pdf_maegak_parsing, write_error_log, pop_upsert_stats
+from checkpoint_journal import open_journal, load_completed_entries, record_outcome, STATUS_DONE, STATUS_STAGED
+from file_fingerprint import get_file_stat, get_file_fingerprint
+from parse_cache import cached_parsing
+from pdf_backends import DEFAULT_BACKEND
+from table_strategy import pop_strategy_stats, merge_strategy_stats
+from db_manager import pop_pool_stats
+from sinks import open_sink, get_sink_journal_path, DEFAULT_SINK, SINK_BULK
+from db_retry import pop_retry_stats
+from dead_letter import write_dead_letter
+from error_logger import flush_error_logs
+from parse_metrics import new_run_metrics, merge_run_metrics
+
+
+# 배치 실행 설정 (환경변수로 변경 가능)
+BATCH_CONFIG = {
+    # 워커 프로세스 수 (기본: CPU 코어 수, 1이면 단일 프로세스로 순차 처리)
+    'workers': int(os.getenv('PARSING_WORKERS', os.cpu_count() or 1)),
+    # 워커당 동시에 제출해 둘 최대 작업 수 (메모리 사용량 제한)
+    'in_flight_per_worker': int(os.getenv('PARSING_IN_FLIGHT', 2)),
+    # 체크포인트 저널 사용 여부 (재실행 시 완료된 파일 건너뛰기)
+    'use_journal': os.getenv('PARSING_USE_JOURNAL', '1') == '1',
+    # 증분 모드: 이전에 완료된 파일도 내용(크기+수정시각 → SHA-256)이 바뀌었으면 다시 처리
+    'incremental': os.getenv('PARSING_INCREMENTAL', '1') == '1',
+    # 저장소 (mysql / sqlite / bulk, 기본: PARSING_SINK)
+    'sink': DEFAULT_SINK,
+    # 대량 적재 모드: 지정하면 DB 대신 이 폴더에 스테이징 파일 기록 (적재는 bulk_loader.py)
+    'bulk_dir': os.getenv('PARSING_BULK_DIR') or None,
+}
+
+
+# 파싱 대상 PDF 목록 수집 (parsing_pdf/<폴더>/VM-02/업로드/*_1.pdf)
+def collect_pdf_targets(full_main_path, target_sub_path):
+    targets = []
+
+    # 폴더명만 필터링하여 리스트업
+    parsing_list_folders = [d for d in os.listdir(full_main_path)
+                            if os.path.isdir(os.path.join(full_main_path, d))]
+
+    for item in parsing_list_folders:
+
+        # 최종 탐색 경로 생성
+        upload_path = os.path.join(full_main_path, item, target_sub_path)
+
+        if os.path.exists(upload_path):
+            # ~_1 로 끝나는 PDF 파일 찾기
+            pdf_files = [f for f in os.listdir(upload_path) if f.lower().endswith('_1.pdf')]
+
+            print(f"{item} 폴더: {len(pdf_files)}개의 PDF 파일이 있습니다.")
+
+            for pdf_file in pdf_files:
+                targets.append((item, pdf_file, os.path.join(upload_path, pdf_file)))
+        else:
+            print(f"{item} : (경로 없음 - {target_sub_path})")
+
+    return targets
+
+
+# 워커: PDF 1건 파싱 후 결과를 부모 프로세스로 반환 (DB 저장은 부모의 BatchWriter 가 묶어서 처리)
+# with_fingerprint: 파일 지문을 계산해서 결과에 포함
+# known_entry: 이전 실행의 저널 기록 (SHA-256이 같으면 파싱/저장 생략)
+def parse_task(item, pdf_file, pdf_full_path, with_fingerprint=False, known_entry=None):
+    outcome = {
+        "item": item,
+        "pdf_file": pdf_file,
+        "pdf_full_path": pdf_full_path,
+        "success": False,
+        "message": "",
+    }
+
+    try:
+        if with_fingerprint:
+            outcome["fingerprint"] = get_file_fingerprint(pdf_full_path)
+
+            # 내용이 이전 성공 실행과 같으면 파싱/DB 저장 생략
+            if known_entry and known_entry["sha256"] == outcome["fingerprint"]["sha256"]:
+                outcome["success"] = True
+                outcome["unchanged"] = True
+                outcome["parent_idx"] = known_entry["parent_idx"]
+                # 이전 기록 상태 유지 (DB 저장 완료 문서를 스테이징 상태로 되돌리지 않음)
+                outcome["journal_status"] = known_entry["status"]
+                outcome["message"] = f"♻️ 변경 없음 (Parent ID: {known_entry['parent_idx']})"
+                return outcome
+
+        # 같은 내용의 PDF는 파싱 결과 캐시 사용
+        sha256 = outcome["fingerprint"]["sha256"] if with_fingerprint else None
+        parse_start = time.perf_counter()
+        parsed_data = cached_parsing(pdf_maegak_parsing, pdf_full_path, sha256)
+        outcome["parse_seconds"] = time.perf_counter() - parse_start
+        # 단계별 시간 측정값 (PARSING_METRICS=1 이고 캐시 미적중일 때만 있음)
+        outcome["metrics"] = parsed_data.get("_metrics")
+
+        if parsed_data["result_code"] == 200:
+            # DB 저장 대상
+            outcome["parsed_data"] = parsed_data
+        else:
+            outcome["message"] = f"파싱 에러 [{parsed_data['result_code']}]: {parsed_data['result_msg']}"
+            outcome["error"] = parsed_data['result_msg']
+            outcome["stage"] = "parse"
+            outcome["error_class"] = parsed_data.get("error_class", f"ResultCode{parsed_data['result_code']}")
+    except Exception as e:
+        outcome["message"] = f"워커 오류: {e}"
+        outcome["stage"] = "worker"
+        outcome["error_class"] = type(e).__name__
+
+    # 테이블 추출 전략 통계 (캐시 적중 시 비어 있음)
+    outcome["strategy_stats"] = pop_strategy_stats()
+
+    return outcome
+
+
+# DB 저장 결과를 워커 결과에 반영 (BatchWriter 콜백)
+def apply_write_result(outcome, success, db_msg, result_message):
+    if success:
+        outcome["success"] = True
+        outcome["message"] = result_message.format(db_msg)
+        outcome["parent_idx"] = db_msg
+    else:
+        outcome["message"] = f"DB Insert Fail: {db_msg}"
+        outcome["stage"] = "db"
+        outcome["error_class"] = "DBWriteError"
+    return outcome
+
+
+# 워커 결과 출력 및 에러 로그 기록 (부모 프로세스에서만 실행)
+# success_status: 성공 문서의 저널 상태값 (대량 적재 모드는 스테이징만 된 상태로 기록)
+def report_outcome(outcome, parsing_folder_name, stats, journal=None, success_status=STATUS_DONE):
+    print(f"   📄 [{outcome['pdf_file']}]")
+
+    # 체크포인트 저널에 결과 기록
+    if journal is not None:
+        record_outcome(journal, outcome["pdf_full_path"], outcome["success"],
+                       parent_idx=outcome.get("parent_idx"),
+                       error_msg=None if outcome["success"] else outcome["message"],
+                       fingerprint=outcome.get("fingerprint") if outcome["success"] else None,
+                       success_status=outcome.get("journal_status", success_status))
+
+    if outcome.get("unchanged"):
+        stats["unchanged"] += 1
+        print(f"      {outcome['message']}")
+    elif outcome["success"]:
+        stats["success"] += 1
+        print(f"      {outcome['message']}")
+    else:
+        stats["fail"] += 1
+        print(f"      ❌ {outcome['message']}")
+        write_error_log(parsing_folder_name, outcome["item"], outcome["pdf_file"],
+                        outcome.get("error", outcome["message"]), stage=outcome.get("stage"),
+                        error_class=outcome.get("error_class"), duration=outcome.get("parse_seconds"))
+
+
+# 배치 실행 (프로세스 풀 + 제출 작업 수 제한)
+def run_batch(full_main_path, target_sub_path, parsing_folder_name, workers=None, in_flight_per_worker=None,
+              use_journal=None, incremental=None, sink=None, bulk_dir=None):
+    workers = workers or BATCH_CONFIG['workers']
+    in_flight_per_worker = in_flight_per_worker or BATCH_CONFIG['in_flight_per_worker']
+    if use_journal is None:
+        use_journal = BATCH_CONFIG['use_journal']
+    if incremental is None:
+        incremental = BATCH_CONFIG['incremental']
+    bulk_dir = bulk_dir or BATCH_CONFIG['bulk_dir']
+    sink = sink or (SINK_BULK if bulk_dir else BATCH_CONFIG['sink'])
+
+    # 작업 단위: (폴더, 파일명, 전체경로, 지문계산여부, 이전 저널 기록)
+    targets = [(item, pdf_file, pdf_full_path, False, None)
+               for item, pdf_file, pdf_full_path in collect_pdf_targets(full_main_path, target_sub_path)]
+    stats = {"total": len(targets), "success": 0, "fail": 0, "skipped": 0, "unchanged": 0, "strategy": {},
+             "db_pool": {}, "dead_letter": 0, "metrics": new_run_metrics()}
+
+    # 대량 적재 모드는 DB 적재 전이므로 스테이징 상태로 기록 (일반 실행은 스테이징 문서를 건너뛰지 않음)
+    success_status = STATUS_STAGED if sink == SINK_BULK else STATUS_DONE
+    completed_statuses = (STATUS_DONE, STATUS_STAGED) if sink == SINK_BULK else (STATUS_DONE,)
+
+    # 이전 실행에서 완료된 파일은 건너뛰기 (실패/미완료 파일만 다시 처리, 저널은 저장소별로 따로 기록)
+    journal = open_journal(get_sink_journal_path(sink)) if use_journal else None
+    if journal is not None:
+        targets = filter_completed_targets(targets, load_completed_entries(journal, completed_statuses),
+                                           incremental)
+        stats["skipped"] = stats["total"] - len(targets)
+        print(f"📒 체크포인트: 완료된 {stats['skipped']}건 건너뜀")
+
+    # 저장은 부모 프로세스에서 처리 (MySQL/SQLite 는 백그라운드 스레드에서 여러 문서를 묶어서 커밋, 파싱과 동시에 진행)
+    writer = open_sink(sink, bulk_dir)
+
+    # 저장 완료된 문서 결과 기록 (저널/통계는 메인 스레드에서만 갱신)
+    # 재시도 후에도 저장에 실패한 문서는 파싱 결과를 데드레터 파일에 보관
+    def report_written(results):
+        for outcome, success, db_msg in results:
+            parsed_data = outcome.pop("parsed_data")
+            if not success:
+                write_dead_letter(parsing_folder_name, outcome, parsed_data, db_msg)
+                stats["dead_letter"] += 1
+            report_outcome(apply_write_result(outcome, success, db_msg, writer.RESULT_MESSAGE),
+                           parsing_folder_name, stats, journal, success_status)
+
+    # 워커 결과 처리: 파싱 성공 문서는 저장 대기열로, 나머지는 바로 결과 기록
+    def handle_outcome(outcome):
+        merge_strategy_stats(stats["strategy"], outcome.pop("strategy_stats", {}))
+        metrics = outcome.pop("metrics", None)
+        if metrics:
+            merge_run_metrics(stats["metrics"], outcome["pdf_file"], metrics)
+
+        parsed_data = outcome.get("parsed_data")
+        if parsed_data is not None:
+            writer.submit(parsed_data, outcome)
+        else:
+            report_outcome(outcome, parsing_folder_name, stats, journal)
+
+        report_written(writer.drain_results())
+
+    try:
+        run_targets(targets, handle_outcome, workers, in_flight_per_worker)
+    finally:
+        # 중단되더라도 대기열에 남은 문서는 저장 후 종료
+        report_written(writer.close())
+        stats["db_pool"] = pop_pool_stats()
+        stats["db_upsert"] = pop_upsert_stats()
+        stats["db_retry"] = pop_retry_stats()
+        stats["db_writer"] = writer.stats
+        if journal is not None:
+            journal.close()
+        flush_error_logs()
+
+    return stats
+
+
+# 저널 기록 기준으로 처리할 대상만 남기기
+def filter_completed_targets(targets, completed_entries, incremental):
+    remaining = []
+
+    for item, pdf_file, pdf_full_path, _, _ in targets:
+        entry = completed_entries.get(pdf_full_path)
+
+        # 처음 보는 파일 또는 실패했던 파일
+        if entry is None:
+            remaining.append((item, pdf_file, pdf_full_path, incremental, None))
+            continue
+
+        # 증분 모드가 아니거나 지문 없이 기록된 파일은 완료로 간주
+        if not incremental or entry["sha256"] is None:
+            continue
+
+        # 크기+수정시각이 같으면 해시 계산 없이 건너뛰기
+        try:
+            if get_file_stat(pdf_full_path) == (entry["file_size"], entry["file_mtime_ns"]):
+                continue
+        except OSError:
+            pass
+
+        # 바뀐 것으로 보이는 파일은 워커에서 SHA-256으로 최종 확인
+        remaining.append((item, pdf_file, pdf_full_path, True, entry))
+
+    return remaining
+
+
+# 대상 파일 처리 (워커 1개면 순차, 아니면 프로세스 풀)
+def run_targets(targets, handle_outcome, workers, in_flight_per_worker):
+    print(f"⚙️ 워커 {workers}개로 {len(targets)}건 처리 시작 (PDF 백엔드: {DEFAULT_BACKEND})")
+
+    # 워커 1개면 프로세스 풀 없이 순차 처리
+    if workers <= 1:
+        for target in targets:
+            handle_outcome(parse_task(*target))
+        return
+
+    max_in_flight = workers * in_flight_per_worker
+    target_iter = iter(targets)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        while True:
+            # 제출 가능한 만큼만 작업 투입
+            while len(pending) < max_in_flight:
+                target = next(target_iter, None)
+                if target is None:
+                    break
+                pending[executor.submit(parse_task, *target)] = target
+
+            if not pending:
+                break
+
+            # 끝난 작업부터 결과 수신
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, pdf_file, pdf_full_path, _, _ = pending.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {"item": item, "pdf_file": pdf_file, "pdf_full_path": pdf_full_path,
+                               "success": False, "message": f"워커 프로세스 오류: {e}", "stage": "worker",
+                               "error_class": type(e).__name__}
+                handle_outcome(outcome)
@@ -0,0 +1,195 @@
+import os
+import io
+import sys
+import glob
+import json
+import time
+import argparse
+import datetime
+from contextlib import redirect_stdout
+
+import module_test_parsing
+from pdf_backends import DEFAULT_BACKEND
+
+try:
+    import resource  # 리눅스/맥에서만 사용 가능
+except ImportError:
+    resource = None
+
+
+# 벤치마크 대상 폴더
+BENCHMARK_FOLDERS = ["test_pdf", "test_251219"]
+
+# 기준 결과 저장 경로
+BASELINE_PATH = os.path.join("benchmark", "baseline.json")
+
+# 기준 대비 느려졌다고 판단하는 비율 / 최소 차이(초)
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_SECONDS = 0.05
+
+# 백분위수 (정렬 후 가장 가까운 순위)
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[idx]
+
+
+# 최대 메모리 사용량 (MB)
+def get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 맥은 바이트, 리눅스는 KB 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# pdf_maegak_parsing 벤치마크 (단계별 시간은 배치 실행과 같은 _metrics 측정값 사용)
+def bench_maegak(pdf_files, repeat, backend):
+    report = {"files": {}, "stages": {}, "pages": 0, "total_seconds": 0.0}
+    stage_runs = {}
+
+    # 첫 실행의 import/폰트 로딩 비용은 측정에서 제외
+    if pdf_files:
+        module_test_parsing.pdf_maegak_parsing(pdf_files[0], backend=backend)
+
+    for pdf_path in pdf_files:
+        times = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = module_test_parsing.pdf_maegak_parsing(pdf_path, backend=backend, with_metrics=True)
+            elapsed = time.perf_counter() - start
+            metrics = result.pop("_metrics")
+
+            times.append(elapsed)
+            report["pages"] += metrics["page_count"]
+            report["total_seconds"] += elapsed
+            for stage, stat in metrics["stages"].items():
+                stage_runs.setdefault(stage, []).append(stat["wall"])
+
+        report["files"][pdf_path] = {
+            "result_code": result["result_code"],
+            "pages": metrics["page_count"],
+            "mean": sum(times) / len(times),
+            "p50": percentile(times, 50),
+            "p95": percentile(times, 95),
+        }
+        print(f"   📄 {pdf_path}: p50 {report['files'][pdf_path]['p50']:.3f}s / {metrics['page_count']}페이지")
+
+    for stage, values in stage_runs.items():
+        report["stages"][stage] = {
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+        }
+
+    report["pages_per_sec"] = report["pages"] / report["total_seconds"] if report["total_seconds"] else 0.0
+    return report
+
+
+# struct_parsing.parse_pdf 벤치마크 (화면 출력은 버림)
+def bench_struct(pdf_files, repeat):
+    import struct_parsing
+
+    report = {"files": {}}
+    for pdf_path in pdf_files:
+        times = []
+        for _ in range(repeat):
+            struct_parsing.bigoFindCheck = False
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                struct_parsing.parse_pdf(pdf_path)
+            times.append(time.perf_counter() - start)
+
+        report["files"][pdf_path] = {
+            "mean": sum(times) / len(times),
+            "p50": percentile(times, 50),
+            "p95": percentile(times, 95),
+        }
+    return report
+
+
+# 기준 결과 대비 느려진 파일 목록
+def find_regressions(report, baseline):
+    regressions = []
+
+    for section in ("maegak", "struct"):
+        base_files = baseline.get(section, {}).get("files", {})
+        for pdf_path, stat in report.get(section, {}).get("files", {}).items():
+            base = base_files.get(pdf_path)
+            if not base:
+                continue
+            if stat["p50"] > base["p50"] * REGRESSION_RATIO and stat["p50"] - base["p50"] > REGRESSION_MIN_SECONDS:
+                regressions.append((section, pdf_path, base["p50"], stat["p50"]))
+
+    return regressions
+
+
+def print_report(report):
+    maegak = report["maegak"]
+    all_times = [f["p50"] for f in maegak["files"].values()]
+
+    print("=" * 45)
+    print(f"📊 pdf_maegak_parsing ({report['backend']}): 파일 p50 {percentile(all_times, 50):.3f}s / "
+          f"p95 {percentile(all_times, 95):.3f}s / {maegak['pages_per_sec']:.1f} pages/sec")
+    for stage, stat in sorted(maegak["stages"].items(), key=lambda x: -x[1]["total"]):
+        print(f"   - {stage:<22} 합계 {stat['total']:.3f}s / p50 {stat['p50']:.4f}s / p95 {stat['p95']:.4f}s")
+
+    if "struct" in report:
+        struct_times = [f["p50"] for f in report["struct"]["files"].values()]
+        print(f"📊 struct_parsing.parse_pdf: 파일 p50 {percentile(struct_times, 50):.3f}s / "
+              f"p95 {percentile(struct_times, 95):.3f}s")
+
+    print(f"💾 최대 메모리: {report['peak_rss_mb']} MB")
+
+
+# 실행
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="매각물건명세서 파싱 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="파일별 반복 횟수")
+    parser.add_argument("--backend", default=None, help="PDF 백엔드 (pdfplumber / fitz)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준 결과 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--skip-struct", action="store_true", help="struct_parsing 측정 생략")
+    args = parser.parse_args()
+
+    pdf_files = sorted(f for folder in BENCHMARK_FOLDERS for f in glob.glob(os.path.join(folder, "*.pdf")))
+    backend = args.backend or DEFAULT_BACKEND
+
+    print(f"🔍 벤치마크 시작: {len(pdf_files)}개 파일 x {args.repeat}회\n" + "=" * 45)
+
+    report = {
+        "created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "backend": backend,
+        "repeat": args.repeat,
+        "maegak": bench_maegak(pdf_files, args.repeat, backend),
+    }
+    if not args.skip_struct:
+        report["struct"] = bench_struct(pdf_files, args.repeat)
+    report["peak_rss_mb"] = get_peak_rss_mb()
+
+    print_report(report)
+
+    # 기준 결과 저장 또는 비교
+    if args.save_baseline:
+        baseline_dir = os.path.dirname(args.baseline)
+        if baseline_dir and not os.path.exists(baseline_dir):
+            os.makedirs(baseline_dir)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✨ 기준 결과 저장: {args.baseline}")
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = find_regressions(report, baseline)
+        if regressions:
+            print(f"❌ 기준({baseline['created']}) 대비 느려진 파일 {len(regressions)}건")
+            for section, pdf_path, base_p50, p50 in regressions:
+                print(f"   - [{section}] {pdf_path}: {base_p50:.3f}s → {p50:.3f}s")
+            sys.exit(1)
+        print(f"✅ 기준({baseline['created']}) 대비 느려진 파일 없음")
@@ -0,0 +1,264 @@
+import os
+import re
+import sys
+import json
+import time
+
+import pymysql
+
+from db_manager import DB_CONFIG, get_db_connection, rollback_quietly
+from module_test_parsing import (
+    build_master_row, build_round_rows, build_occupant_rows,
+    MASTER_INSERT_SQL, ROUNDS_INSERT_SQL, OCCUPANTS_INSERT_SQL,
+)
+
+
+# 대량 적재 설정 (환경변수로 변경 가능)
+BULK_CONFIG = {
+    # 매각 테이블 기본키 컬럼명 (자식 테이블의 parent_idx 가 가리키는 컬럼)
+    'master_key': os.getenv('BULK_MASTER_KEY', 'idx'),
+    # 첫 parent_idx (지정하지 않으면 DB의 현재 최대값 + 1)
+    'start_key': int(os.getenv('BULK_START_KEY', 0)) or None,
+}
+
+# 스테이징 파일명 (테이블명.tsv) / 메타 정보 파일
+STAGING_TABLES = ("tmp_maegak", "tmp_maegak_rounds", "tmp_maegak_occupants")
+STAGING_META = "staging.json"
+
+# TSV 이스케이프 (LOAD DATA 기본 형식: 탭 구분, 역슬래시 이스케이프, NULL 은 \N)
+TSV_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+TSV_ESCAPE_PATTERN = re.compile(r"[\\\t\n\r\0]")
+
+
+# INSERT 문에서 컬럼 목록 추출
+def get_insert_columns(insert_sql):
+    column_part = insert_sql.split("(", 1)[1].split(")", 1)[0]
+    return [c.strip() for c in column_part.split(",")]
+
+
+def to_tsv_field(val):
+    if val is None:
+        return "\\N"
+    return TSV_ESCAPE_PATTERN.sub(lambda m: TSV_ESCAPES[m.group()], str(val))
+
+
+def to_tsv_line(row):
+    return "\t".join(to_tsv_field(v) for v in row) + "\n"
+
+
+# DB의 매각 테이블 다음 parent_idx
+def get_next_master_key(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(MAX({BULK_CONFIG['master_key']}), 0) + 1 FROM tmp_maegak")
+        return cursor.fetchone()[0]
+
+
+class StagingWriter:
+    """
+    파싱 결과를 DB 대신 테이블별 TSV 스테이징 파일로 기록하는 객체 (대량 적재용).
+    parent_idx 는 start_key 부터 직접 발급하고, 같은 폴더에 다시 기록하면 이어서 발급합니다.
+    BackgroundWriter 와 같은 방식(submit / drain_results / close)으로 사용합니다.
+    """
+
+    RESULT_MESSAGE = "📝 스테이징 기록 완료 (Parent ID: {})"
+
+    def __init__(self, staging_dir, start_key=None):
+        self.staging_dir = staging_dir
+        if not os.path.exists(staging_dir):
+            os.makedirs(staging_dir)
+
+        # 이전 기록이 있으면 이어서 발급
+        meta = load_staging_meta(staging_dir)
+        if meta:
+            self.first_key = meta["first_key"]
+            self.next_key = meta["next_key"]
+        else:
+            self.first_key = self.next_key = start_key or BULK_CONFIG['start_key'] or 1
+
+        # 강제 종료(OOM/SIGKILL)로 close() 없이 끝난 경우 메타의 next_key 가 뒤처져 있으므로
+        # 파일에 이미 기록된 가장 큰 parent_idx 다음부터 발급 (끝에 잘린 줄은 먼저 제거)
+        written_keys = []
+        for table in STAGING_TABLES:
+            drop_partial_line(os.path.join(staging_dir, f"{table}.tsv"))
+            written_keys.extend(read_staging_keys(staging_dir, table))
+        if written_keys:
+            if not meta:
+                self.first_key = min(written_keys)
+            self.next_key = max(self.next_key, max(written_keys) + 1)
+
+        # 시작 값을 바로 기록 (중간에 종료되어도 적재 가능)
+        save_staging_meta(staging_dir, {"first_key": self.first_key, "next_key": self.next_key})
+
+        self._files = {table: open(os.path.join(staging_dir, f"{table}.tsv"), "a", encoding="utf-8", newline="")
+                       for table in STAGING_TABLES}
+        self._results = []
+        self.stats = {"documents": 0}
+
+    def submit(self, data, context):
+        parent_idx = self.next_key
+        self.next_key += 1
+
+        # clean_special_chars 는 build_*_row 에서 적용
+        self._files["tmp_maegak"].write(to_tsv_line((parent_idx,) + build_master_row(data)))
+        self._files["tmp_maegak_rounds"].writelines(
+            to_tsv_line(row) for row in build_round_rows(parent_idx, data['auction_rounds']))
+        self._files["tmp_maegak_occupants"].writelines(
+            to_tsv_line(row) for row in build_occupant_rows(parent_idx, data['occupants']))
+
+        # 저널에 완료로 기록되기 전에 파일까지 내려보냄 (프로세스가 죽어도 기록 유지)
+        for f in self._files.values():
+            f.flush()
+
+        self.stats["documents"] += 1
+        self._results.append((context, True, parent_idx))
+
+    def drain_results(self):
+        results, self._results = self._results, []
+        return results
+
+    def close(self):
+        if self._files:
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+            save_staging_meta(self.staging_dir, {"first_key": self.first_key, "next_key": self.next_key})
+        return self.drain_results()
+
+
+# 스테이징 기록 객체 생성 (첫 parent_idx: 이전 기록 → BULK_START_KEY → DB 최대값 + 1 순서로 결정)
+def open_staging_writer(staging_dir):
+    start_key = BULK_CONFIG['start_key']
+
+    if start_key is None and load_staging_meta(staging_dir) is None:
+        conn = get_db_connection()
+        if conn:
+            try:
+                start_key = get_next_master_key(conn)
+            finally:
+                conn.close()
+        else:
+            print("⚠️ DB에서 시작 parent_idx 를 확인하지 못해 1부터 발급합니다 (적재 시 충돌 검사)")
+
+    writer = StagingWriter(staging_dir, start_key)
+    print(f"📝 대량 적재 모드: {staging_dir} (parent_idx {writer.next_key}부터 발급)")
+    return writer
+
+
+def load_staging_meta(staging_dir):
+    meta_path = os.path.join(staging_dir, STAGING_META)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 메타 정보 저장 (임시 파일에 쓴 뒤 교체, 중간에 종료되어도 깨진 파일이 남지 않음)
+def save_staging_meta(staging_dir, meta):
+    meta_path = os.path.join(staging_dir, STAGING_META)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+# 스테이징 파일의 parent_idx 목록 (각 줄 첫 컬럼: 매각 테이블은 자기 키, 자식 테이블은 parent_idx)
+def read_staging_keys(staging_dir, table):
+    path = os.path.join(staging_dir, f"{table}.tsv")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8", newline="") as f:
+        return [int(line.split("\t", 1)[0]) for line in f if line.endswith("\n")]
+
+
+# 끝에 줄바꿈 없이 잘린 줄 제거 (기록 도중 강제 종료된 경우, 값 안의 줄바꿈은 \n 으로 이스케이프되어 있음)
+def drop_partial_line(path, chunk_size=65536):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk_size)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            newline_idx = chunk.rfind(b"\n")
+            if newline_idx != -1:
+                pos = start + newline_idx + 1
+                break
+            pos = start
+        if pos != end:
+            print(f"⚠️ 잘린 줄 제거: {path} ({end - pos}바이트)")
+            f.truncate(pos)
+
+
+# 스테이징 파일을 테이블별 LOAD DATA 1번으로 적재 (반환: (성공 여부, 테이블별 행 수 또는 에러 메시지))
+def load_staging(staging_dir):
+    meta = load_staging_meta(staging_dir)
+    if not meta:
+        return False, f"스테이징 정보 없음 ({os.path.join(staging_dir, STAGING_META)})"
+
+    # parent_idx 가 중복된 파일은 적재하지 않음 (LOAD DATA 는 중복 키를 조용히 건너뛰어 자식 행이 다른 문서에 붙음)
+    for table in STAGING_TABLES:
+        drop_partial_line(os.path.join(staging_dir, f"{table}.tsv"))
+    master_keys = read_staging_keys(staging_dir, "tmp_maegak")
+    duplicate_count = len(master_keys) - len(set(master_keys))
+    if duplicate_count:
+        return False, f"parent_idx 중복 {duplicate_count}건 (tmp_maegak.tsv), 스테이징 파일을 다시 만들어야 합니다"
+    first_key = min(master_keys, default=meta["first_key"])
+
+    table_columns = {
+        "tmp_maegak": [BULK_CONFIG['master_key']] + get_insert_columns(MASTER_INSERT_SQL),
+        "tmp_maegak_rounds": get_insert_columns(ROUNDS_INSERT_SQL),
+        "tmp_maegak_occupants": get_insert_columns(OCCUPANTS_INSERT_SQL),
+    }
+
+    try:
+        conn = pymysql.connect(**DB_CONFIG, local_infile=True)
+    except Exception as e:
+        return False, f"DB Connection Error: {e}"
+
+    try:
+        with conn.cursor() as cursor:
+            # 적재 중 다른 INSERT 로 parent_idx 가 겹치지 않도록 테이블 잠금
+            cursor.execute("LOCK TABLES " + ", ".join(f"{table} WRITE" for table in STAGING_TABLES))
+
+            next_key = get_next_master_key(conn)
+            if next_key > first_key:
+                raise ValueError(f"parent_idx 충돌: DB 최대값 {next_key - 1} >= 스테이징 시작값 {first_key}")
+
+            row_counts = {}
+            for table in STAGING_TABLES:
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                    f"({', '.join(table_columns[table])})",
+                    (os.path.abspath(os.path.join(staging_dir, f"{table}.tsv")),))
+                row_counts[table] = cursor.rowcount
+
+            conn.commit()
+            cursor.execute("UNLOCK TABLES")
+        return True, row_counts
+    except Exception as e:
+        rollback_quietly(conn)
+        return False, str(e)
+    finally:
+        conn.close()
+
+
+# 실행: python bulk_loader.py <스테이징 폴더>
+if __name__ == "__main__":
+
+    if len(sys.argv) != 2:
+        print("사용법: python bulk_loader.py <스테이징 폴더>")
+        sys.exit(1)
+
+    start_time = time.time()
+    success, result = load_staging(sys.argv[1])
+
+    if not success:
+        print(f"❌ 대량 적재 실패: {result}")
+        sys.exit(1)
+
+    for table, count in result.items():
+        print(f"   📥 {table}: {count}행")
+    print(f"✨ 대량 적재 완료 ({time.time() - start_time:.1f}초)")
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import datetime
+
+
+# 체크포인트 저널 경로 (환경변수로 변경 가능)
+JOURNAL_PATH = os.getenv('PARSING_JOURNAL', os.path.join("checkpoint", "parsing_journal.db"))
+
+# 처리 상태값
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+# 대량 적재 모드: 스테이징 파일에만 기록된 상태 (DB 적재 전이므로 일반 실행에서는 건너뛰지 않음)
+STATUS_STAGED = "staged"
+
+
+def open_journal(journal_path=JOURNAL_PATH):
+    """체크포인트 저널(SQLite) 연결 객체를 반환하는 공통 함수"""
+    journal_dir = os.path.dirname(journal_path)
+    if journal_dir and not os.path.exists(journal_dir):
+        os.makedirs(journal_dir)
+
+    conn = sqlite3.connect(journal_path)
+    # 중간에 프로세스가 죽어도 기록이 남도록 WAL 모드 사용
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS parsing_journal (
+            pdf_full_path TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            parent_idx INTEGER,
+            error_msg TEXT,
+            updated_at TEXT NOT NULL,
+            file_size INTEGER,
+            file_mtime_ns INTEGER,
+            sha256 TEXT
+        )
+    """)
+
+    # 파일 지문 컬럼이 없는 이전 저널 파일 보정
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(parsing_journal)")}
+    for column, column_type in (("file_size", "INTEGER"), ("file_mtime_ns", "INTEGER"), ("sha256", "TEXT")):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE parsing_journal ADD COLUMN {column} {column_type}")
+
+    conn.commit()
+    return conn
+
+
+# 완료된 파일 목록 (재실행 시 건너뛰기용, dict로 O(1) 조회)
+# statuses: 완료로 볼 상태값 (기본: DB 저장 완료만)
+# 반환: {pdf_full_path: {"status", "parent_idx", "file_size", "file_mtime_ns", "sha256"}}
+def load_completed_entries(conn, statuses=(STATUS_DONE,)):
+    placeholders = ", ".join("?" for _ in statuses)
+    rows = conn.execute(f"""
+        SELECT pdf_full_path, status, parent_idx, file_size, file_mtime_ns, sha256
+        FROM parsing_journal WHERE status IN ({placeholders})
+    """, tuple(statuses))
+    return {
+        row[0]: {"status": row[1], "parent_idx": row[2], "file_size": row[3], "file_mtime_ns": row[4],
+                 "sha256": row[5]}
+        for row in rows
+    }
+
+
+# 파일 1건 처리 결과 기록 (성공: parent_idx, 실패: error_msg, 성공 시 파일 지문 포함)
+# success_status: 성공 시 기록할 상태값 (대량 적재 모드는 STATUS_STAGED)
+def record_outcome(conn, pdf_full_path, success, parent_idx=None, error_msg=None, fingerprint=None,
+                   success_status=STATUS_DONE):
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    fingerprint = fingerprint or {}
+    conn.execute("""
+        INSERT INTO parsing_journal (
+            pdf_full_path, status, parent_idx, error_msg, updated_at, file_size, file_mtime_ns, sha256
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(pdf_full_path) DO UPDATE SET
+            status = excluded.status,
+            parent_idx = excluded.parent_idx,
+            error_msg = excluded.error_msg,
+            updated_at = excluded.updated_at,
+            file_size = excluded.file_size,
+            file_mtime_ns = excluded.file_mtime_ns,
+            sha256 = excluded.sha256
+    """, (pdf_full_path, success_status if success else STATUS_ERROR, parent_idx, error_msg, timestamp,
+          fingerprint.get("file_size"), fingerprint.get("file_mtime_ns"), fingerprint.get("sha256")))
+    conn.commit()
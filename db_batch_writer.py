@@ -0,0 +1,250 @@
+import os
+import time
+import queue
+import threading
+
+from db_manager import pooled_connection, rollback_quietly
+from db_retry import run_with_retry, commit_checked
+from module_test_parsing import (
+    save_to_db, upsert_document, insert_document, find_saved_master,
+    build_master_row, build_round_rows, build_occupant_rows,
+    MASTER_INSERT_SQL, ROUNDS_INSERT_SQL, OCCUPANTS_INSERT_SQL, SAVE_CONFIG, UPSERT_STATS,
+)
+
+
+# 그룹 커밋 설정 (환경변수로 변경 가능)
+WRITER_CONFIG = {
+    # 이 문서 수만큼 모이면 커밋
+    'batch_size': int(os.getenv('DB_WRITE_BATCH_SIZE', 50)),
+    # 첫 문서가 들어온 뒤 이 시간(ms)이 지나면 개수와 관계없이 커밋
+    'flush_ms': int(os.getenv('DB_WRITE_FLUSH_MS', 1000)),
+    # 백그라운드 DB 저장 스레드 수
+    'threads': int(os.getenv('DB_WRITE_THREADS', 1)),
+    # 저장 대기열 최대 문서 수 (가득 차면 파싱 쪽이 대기 → DB가 밀릴 때 메모리 사용량 제한)
+    'queue_size': int(os.getenv('DB_WRITE_QUEUE_SIZE', 100)),
+}
+
+
+# 매각 테이블 여러 행 INSERT 문 (INSERT 1번 = AUTO_INCREMENT 값이 연속으로 발급됨)
+def build_multi_row_sql(single_row_sql, row_count):
+    head, placeholder = single_row_sql.rsplit("VALUES", 1)
+    return head + "VALUES " + ", ".join([placeholder.strip()] * row_count)
+
+
+class BatchWriter:
+    """
+    여러 문서의 파싱 결과를 모아서 한 트랜잭션으로 저장하는 객체.
+    batch_size 개가 모이거나 flush_ms 가 지나면 저장하고, 문서별 결과를 on_result(context, success, msg)로 알려줍니다.
+    묶음 저장이 실패하면 문서별로 다시 저장해서 문제 문서만 실패 처리합니다.
+    다른 저장소는 _write_batch / _write_one 을 바꾼 하위 클래스로 만듭니다.
+    """
+
+    RESULT_MESSAGE = "✅ DB 저장 완료 (Parent ID: {})"
+
+    def __init__(self, on_result, batch_size=None, flush_ms=None):
+        self.on_result = on_result
+        self.batch_size = batch_size or WRITER_CONFIG['batch_size']
+        self.flush_ms = flush_ms if flush_ms is not None else WRITER_CONFIG['flush_ms']
+
+        self._buffer = []  # [(data, context)]
+        self._first_added_at = None
+        # 현재 묶음이 커밋 중 연결이 끊긴 적이 있는지 (있으면 문서별 재저장도 저장 여부 확인 후 저장)
+        self._commit_uncertain = False
+        self.stats = {"batches": 0, "documents": 0, "batch_failures": 0}
+
+    def add(self, data, context):
+        if not self._buffer:
+            self._first_added_at = time.time()
+        self._buffer.append((data, context))
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    # 다음 시간 기준 저장까지 남은 시간(초), 버퍼가 비어 있으면 None
+    def time_until_flush(self):
+        if not self._buffer:
+            return None
+        return max(0.0, self.flush_ms / 1000 - (time.time() - self._first_added_at))
+
+    def flush_if_due(self):
+        if self._buffer and self.time_until_flush() <= 0:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        buffer, self._buffer = self._buffer, []
+        self._first_added_at = None
+        self._commit_uncertain = False
+
+        success, result = self._write_batch([data for data, _ in buffer])
+
+        if success:
+            self.stats["batches"] += 1
+            self.stats["documents"] += len(buffer)
+            for (_, context), parent_idx in zip(buffer, result):
+                self.on_result(context, True, parent_idx)
+            return
+
+        # 묶음 저장 실패: 문서별로 다시 저장해서 문제 문서만 분리
+        self.stats["batch_failures"] += 1
+        for data, context in buffer:
+            doc_success, msg = self._write_one(data, verify=self._commit_uncertain)
+            if doc_success:
+                self.stats["documents"] += 1
+            self.on_result(context, doc_success, msg)
+
+    def close(self):
+        self.flush()
+
+    # 문서 1건 저장 (반환: (성공 여부, parent_idx 또는 에러 메시지))
+    # verify: 묶음 커밋 여부를 모르는 경우 (이미 저장된 문서는 다시 추가하지 않음)
+    def _write_one(self, data, verify=False):
+        return save_to_db(data, verify=verify)
+
+    # 문서 묶음을 한 트랜잭션으로 저장 (반환: (성공 여부, parent_idx 목록 또는 에러 메시지))
+    # 데드락/락 대기 초과/연결 끊김은 묶음 전체를 잠시 후 다시 시도 (커밋 중 끊긴 경우는 저장 여부 확인 후)
+    def _write_batch(self, docs):
+        try:
+            return True, run_with_retry(self._write_batch_once, docs, verify=False)
+        except Exception as e:
+            return False, str(e)
+
+    # 묶음 저장 1회 (반환: parent_idx 목록, 실패 시 롤백 후 에러 발생)
+    # verify: 이전 시도의 커밋 여부를 모르는 재시도 (이미 저장된 문서는 그 parent_idx 사용, 나머지만 추가)
+    def _write_batch_once(self, docs, verify=False):
+        if verify:
+            self._commit_uncertain = True
+
+        with pooled_connection() as conn:
+            if not conn:
+                raise ConnectionError("DB Connection Error")
+
+            cursor = conn.cursor()
+            try:
+                # 중복 방지 모드: 문서별로 조회 후 갱신/생략하고 커밋만 묶음으로
+                if SAVE_CONFIG['upsert']:
+                    results = [upsert_document(cursor, data) for data in docs]
+                    commit_checked(conn)
+                    for _, action in results:
+                        UPSERT_STATS[action] += 1
+                    return [parent_idx for parent_idx, _ in results]
+
+                if verify:
+                    parent_ids = [find_saved_master(cursor, build_master_row(data)) or insert_document(cursor, data)
+                                  for data in docs]
+                    commit_checked(conn)
+                    return parent_ids
+
+                # 매각 테이블: 여러 행을 INSERT 1번으로
+                master_rows = [build_master_row(data) for data in docs]
+                cursor.execute(build_multi_row_sql(MASTER_INSERT_SQL, len(docs)),
+                               [v for row in master_rows for v in row])
+
+                # INSERT 1번의 AUTO_INCREMENT 값은 첫 행 ID부터 increment 간격으로 연속 발급
+                first_idx = cursor.lastrowid
+                cursor.execute("SELECT @@SESSION.auto_increment_increment")
+                increment = cursor.fetchone()[0] or 1
+                parent_ids = [first_idx + i * increment for i in range(len(docs))]
+
+                # 자식 테이블: 문서별 parent_idx 를 붙여서 한꺼번에 저장
+                round_rows = []
+                occupant_rows = []
+                for data, parent_idx in zip(docs, parent_ids):
+                    round_rows.extend(build_round_rows(parent_idx, data['auction_rounds']))
+                    occupant_rows.extend(build_occupant_rows(parent_idx, data['occupants']))
+
+                if round_rows:
+                    cursor.executemany(ROUNDS_INSERT_SQL, round_rows)
+                if occupant_rows:
+                    cursor.executemany(OCCUPANTS_INSERT_SQL, occupant_rows)
+
+                commit_checked(conn)
+                return parent_ids
+            except Exception:
+                rollback_quietly(conn)
+                raise
+
+
+class BackgroundWriter:
+    """
+    파싱과 DB 저장을 겹쳐서 실행하기 위한 백그라운드 저장 스레드 묶음.
+    submit() 으로 넣은 문서를 스레드별 BatchWriter 가 묶어서 저장하고,
+    문서별 결과는 drain_results() 로 호출한 스레드(부모 프로세스 메인 스레드)에서 꺼내 갑니다.
+    writer_class: 스레드별 저장 객체 (BatchWriter 또는 하위 클래스)
+    """
+
+    def __init__(self, threads=None, queue_size=None, batch_size=None, flush_ms=None, writer_class=BatchWriter):
+        threads = threads or WRITER_CONFIG['threads']
+        queue_size = queue_size or WRITER_CONFIG['queue_size']
+        self.RESULT_MESSAGE = writer_class.RESULT_MESSAGE
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._results = queue.Queue()
+        self._writers = [writer_class(self._put_result, batch_size, flush_ms) for _ in range(threads)]
+        self._threads = [threading.Thread(target=self._run, args=(writer,), name=f"db-writer-{idx}", daemon=True)
+                         for idx, writer in enumerate(self._writers)]
+        self._closed = False
+        self._blocked = {"count": 0, "seconds": 0.0}
+
+        for thread in self._threads:
+            thread.start()
+
+    # 저장할 문서 넣기 (대기열이 가득 차면 빈자리가 생길 때까지 대기)
+    def submit(self, data, context):
+        try:
+            self._queue.put_nowait((data, context))
+        except queue.Full:
+            start = time.time()
+            self._queue.put((data, context))
+            self._blocked["count"] += 1
+            self._blocked["seconds"] += time.time() - start
+
+    # 저장이 끝난 문서의 결과 목록 [(context, success, parent_idx 또는 에러 메시지)]
+    def drain_results(self):
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    # 남은 문서를 모두 저장하고 스레드 종료 (반환: 남아 있던 결과 목록)
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+        return self.drain_results()
+
+    @property
+    def stats(self):
+        stats = {"batches": 0, "documents": 0, "batch_failures": 0}
+        for writer in self._writers:
+            for k, v in writer.stats.items():
+                stats[k] += v
+        stats["queue_blocked"] = self._blocked["count"]
+        stats["queue_blocked_seconds"] = self._blocked["seconds"]
+        return stats
+
+    def _put_result(self, context, success, msg):
+        self._results.put((context, success, msg))
+
+    # 저장 스레드: 대기열에서 문서를 받아 묶음 저장 (None 을 받으면 남은 문서 저장 후 종료)
+    def _run(self, writer):
+        while True:
+            try:
+                item = self._queue.get(timeout=writer.time_until_flush())
+            except queue.Empty:
+                writer.flush_if_due()
+                continue
+
+            if item is None:
+                writer.close()
+                return
+
+            writer.add(*item)
+            writer.flush_if_due()
@@ -1,4 +1,8 @@
 import os
+import time
+import threading
+from contextlib import contextmanager
+
 import pymysql
 from dotenv import load_dotenv
 
@@ -14,6 +18,19 @@ DB_CONFIG = {
     'autocommit': False
 }
 
+# 커넥션 풀 설정
+POOL_CONFIG = {
+    # 프로세스당 최대 연결 수
+    'size': int(os.getenv('DB_POOL_SIZE', 4)),
+    # 연결 최대 사용 시간(초), 초과 시 닫고 새로 연결
+    'max_lifetime': int(os.getenv('DB_POOL_MAX_LIFETIME', 3600)),
+    # 이 시간(초) 이상 쉬었던 연결은 빌려주기 전에 ping 으로 상태 확인
+    'ping_interval': int(os.getenv('DB_POOL_PING_INTERVAL', 30)),
+    # 빈 연결을 기다리는 최대 시간(초)
+    'wait_timeout': int(os.getenv('DB_POOL_WAIT_TIMEOUT', 30)),
+}
+
+
 def get_db_connection():
     """DB 연결 객체를 반환하는 공통 함수"""
     try:
@@ -22,3 +39,190 @@ def get_db_connection():
     except Exception as e:
         print(f"❌ DB 연결 실패: {e}")
         return None
+
+
+class ConnectionPool:
+    """
+    프로세스 단위 DB 커넥션 풀.
+    같은 스레드는 직전에 쓰던 연결을 우선 다시 받습니다.
+    """
+
+    def __init__(self, size, max_lifetime, ping_interval, wait_timeout):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.wait_timeout = wait_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []  # [(conn, created_at, returned_at)]
+        self._created_at = {}  # id(conn) -> 생성 시각
+        self._in_use = 0
+        self._local = threading.local()
+        self.stats = new_pool_stats()
+
+    # 연결 1개 빌리기 (실패 시 None)
+    def acquire(self):
+        wait_start = time.time()
+
+        with self._cond:
+            while True:
+                entry = self._pop_idle()
+                if entry is not None:
+                    self._in_use += 1
+                    break
+
+                # 여유가 있으면 새로 연결
+                if self._in_use + len(self._idle) < self.size:
+                    self._in_use += 1
+                    entry = None
+                    break
+
+                # 빈 연결이 생길 때까지 대기
+                self.stats["waits"] += 1
+                remaining = self.wait_timeout - (time.time() - wait_start)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    self.stats["timeouts"] += 1
+                    print("❌ DB 커넥션 풀 대기 시간 초과")
+                    return None
+
+            self.stats["wait_seconds"] += time.time() - wait_start
+
+        # 상태 확인 (오래 쉬었거나 수명이 지난 연결은 교체)
+        if entry is not None:
+            conn, created_at, returned_at = entry
+            if self._is_usable(conn, created_at, returned_at):
+                self.stats["hits"] += 1
+                self._local.last_conn_id = id(conn)
+                return conn
+            self._close(conn)
+
+        conn = get_db_connection()
+        with self._cond:
+            self.stats["misses"] += 1
+            if conn is None:
+                self._in_use -= 1
+                self._cond.notify()
+                return None
+            self._created_at[id(conn)] = time.time()
+
+        self._local.last_conn_id = id(conn)
+        return conn
+
+    # 연결 반납 (discard=True 면 닫고 버림)
+    def release(self, conn, discard=False):
+        with self._cond:
+            self._in_use -= 1
+            created_at = self._created_at.get(id(conn), 0)
+
+            if discard:
+                self._created_at.pop(id(conn), None)
+            else:
+                self._idle.append((conn, created_at, time.time()))
+            self._cond.notify()
+
+        if discard:
+            self.stats["discarded"] += 1
+            self._close(conn)
+
+    # 대기 중인 연결 중 이 스레드가 직전에 쓰던 연결 우선, 없으면 가장 최근에 반납된 연결
+    def _pop_idle(self):
+        if not self._idle:
+            return None
+
+        last_conn_id = getattr(self._local, "last_conn_id", None)
+        for idx, entry in enumerate(self._idle):
+            if id(entry[0]) == last_conn_id:
+                return self._idle.pop(idx)
+        return self._idle.pop()
+
+    def _is_usable(self, conn, created_at, returned_at):
+        if not conn.open:
+            self.stats["ping_failures"] += 1
+            return False
+
+        now = time.time()
+        if now - created_at > self.max_lifetime:
+            self.stats["expired"] += 1
+            return False
+
+        if now - returned_at > self.ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self.stats["ping_failures"] += 1
+                return False
+
+        return True
+
+    def _close(self, conn):
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # 대기 중인 연결 모두 닫기
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._close(conn)
+
+
+def new_pool_stats():
+    return {"hits": 0, "misses": 0, "waits": 0, "wait_seconds": 0.0, "timeouts": 0,
+            "expired": 0, "ping_failures": 0, "discarded": 0}
+
+
+# 프로세스별 풀 (fork 된 워커는 부모의 연결을 쓰지 않고 새 풀 생성)
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(**POOL_CONFIG)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """풀에서 연결을 빌려주고 블록이 끝나면 반납하는 공통 함수 (연결 실패 시 None)"""
+    pool = get_pool()
+    conn = pool.acquire()
+    if conn is None:
+        yield None
+        return
+
+    discard = False
+    try:
+        yield conn
+    except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+        # 연결 자체가 끊긴 경우 재사용하지 않음
+        discard = True
+        raise
+    finally:
+        # 에러 종류와 관계없이 소켓이 닫힌 연결(2006/2013 후 pymysql 이 닫음)도 버림
+        pool.release(conn, discard=discard or not conn.open)
+
+
+# 롤백 (연결이 끊겨 롤백이 실패해도 원래 에러가 가려지지 않도록 롤백 에러는 무시)
+def rollback_quietly(conn):
+    try:
+        conn.rollback()
+    except Exception as e:
+        print(f"      ⚠️ 롤백 실패 (연결 끊김): {e}")
+
+
+# 풀 통계 반환 후 초기화 (워커 → 부모 프로세스 전달용)
+def pop_pool_stats():
+    pool = get_pool()
+    stats = dict(pool.stats)
+    pool.stats = new_pool_stats()
+    return stats
@@ -0,0 +1,90 @@
+import os
+import time
+import random
+
+import pymysql
+
+
+# DB 재시도 설정 (환경변수로 변경 가능)
+RETRY_CONFIG = {
+    # 최대 시도 횟수 (첫 시도 포함)
+    'max_attempts': int(os.getenv('DB_RETRY_MAX_ATTEMPTS', 5)),
+    # 첫 재시도 대기 시간(초), 이후 2배씩 증가
+    'base_delay': float(os.getenv('DB_RETRY_BASE_DELAY', 0.2)),
+    # 최대 대기 시간(초)
+    'max_delay': float(os.getenv('DB_RETRY_MAX_DELAY', 10)),
+}
+
+# 다시 시도하면 성공할 수 있는 MySQL 에러 코드
+RETRYABLE_ERROR_CODES = {
+    1205: "lock_timeout",  # Lock wait timeout exceeded
+    1213: "deadlock",  # Deadlock found when trying to get lock
+    2003: "connection_lost",  # Can't connect to MySQL server
+    2006: "connection_lost",  # MySQL server has gone away
+    2013: "connection_lost",  # Lost connection to MySQL server during query
+    2055: "connection_lost",  # Lost connection to MySQL server (system error)
+}
+
+# 재시도 건수 (에러 종류별)
+RETRY_STATS = {}
+
+
+class CommitUncertainError(Exception):
+    """커밋 요청을 보낸 뒤 연결이 끊겨 서버에 저장됐는지 알 수 없는 경우 (원래 에러는 __cause__)"""
+
+
+# 커밋 (커밋 중 연결이 끊기면 CommitUncertainError: 그대로 다시 저장하면 중복될 수 있음)
+def commit_checked(conn):
+    try:
+        conn.commit()
+    except Exception as e:
+        if classify_db_error(e) == "connection_lost":
+            raise CommitUncertainError(f"커밋 중 연결 끊김, 저장 여부 확인 필요: {e}") from e
+        raise
+
+
+# 재시도 대상 에러 종류 (대상이 아니면 None)
+def classify_db_error(e):
+    if isinstance(e, CommitUncertainError):
+        return "commit_uncertain"
+    if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InternalError)) and e.args:
+        return RETRYABLE_ERROR_CODES.get(e.args[0])
+    if isinstance(e, (ConnectionError, pymysql.err.InterfaceError)):
+        return "connection_lost"
+    return None
+
+
+# 재시도 대기 시간 (지수 증가 + 전체 지터: 여러 워커가 동시에 재시도하지 않도록 0 ~ 상한 사이 무작위)
+def get_backoff_seconds(attempt):
+    return random.uniform(0, min(RETRY_CONFIG['max_delay'], RETRY_CONFIG['base_delay'] * (2 ** attempt)))
+
+
+# func(*args) 실행, 일시적인 DB 에러면 대기 후 다시 시도 (마지막 에러는 그대로 발생)
+# 커밋 중 연결이 끊긴 경우는 func 가 verify 인자를 받을 때만(verify=False 로 호출) verify=True 로 다시 실행
+# (verify=True 인 func 는 이미 저장된 문서를 먼저 확인하고 없는 것만 저장)
+def run_with_retry(func, *args, **kwargs):
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            error_kind = classify_db_error(e)
+            attempt += 1
+            if error_kind is None or attempt >= RETRY_CONFIG['max_attempts']:
+                raise
+            if error_kind == "commit_uncertain":
+                if "verify" not in kwargs:
+                    raise
+                kwargs["verify"] = True
+
+            RETRY_STATS[error_kind] = RETRY_STATS.get(error_kind, 0) + 1
+            delay = get_backoff_seconds(attempt - 1)
+            print(f"      🔁 DB 재시도 {attempt}/{RETRY_CONFIG['max_attempts'] - 1} ({error_kind}, {delay:.2f}초 후): {e}")
+            time.sleep(delay)
+
+
+# 재시도 통계 반환 후 초기화
+def pop_retry_stats():
+    stats = dict(RETRY_STATS)
+    RETRY_STATS.clear()
+    return stats
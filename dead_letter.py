@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import datetime
+
+from module_test_parsing import save_to_db
+from checkpoint_journal import open_journal, record_outcome
+
+
+# 데드레터 설정 (환경변수로 변경 가능)
+DEAD_LETTER_CONFIG = {
+    # 저장 실패 문서 보관 폴더 (dead_letter/dead_letter_<폴더명>.jsonl)
+    'dir': os.getenv('PARSING_DEAD_LETTER_DIR', 'dead_letter'),
+}
+
+
+def get_dead_letter_path(parsing_folder_name):
+    return os.path.join(DEAD_LETTER_CONFIG['dir'], f"dead_letter_{parsing_folder_name}.jsonl")
+
+
+# 재시도 후에도 DB 저장에 실패한 문서를 파싱 결과와 함께 기록 (PDF 다시 파싱 없이 재적재 가능)
+def write_dead_letter(parsing_folder_name, outcome, data, error_msg):
+    dead_letter_dir = DEAD_LETTER_CONFIG['dir']
+    if not os.path.exists(dead_letter_dir):
+        os.makedirs(dead_letter_dir)
+
+    entry = {
+        "time": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "item": outcome["item"],
+        "pdf_file": outcome["pdf_file"],
+        "pdf_full_path": outcome["pdf_full_path"],
+        "fingerprint": outcome.get("fingerprint"),
+        "error": error_msg,
+        "data": data,
+    }
+
+    # 한 줄 단위로 추가 후 디스크까지 기록 (중간에 종료되어도 앞선 기록은 유지)
+    with open(get_dead_letter_path(parsing_folder_name), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# 데드레터 파일 재적재 (성공한 문서는 파일에서 빼고 저널에 완료 기록, 반환: (성공 건수, 남은 건수))
+def replay_dead_letter(path, use_journal=True):
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    journal = open_journal() if use_journal else None
+    remaining = []
+    success_count = 0
+
+    try:
+        for entry in entries:
+            # 커밋 중 연결이 끊겨 실제로는 저장된 문서일 수 있으므로 저장 여부 확인 후 저장
+            success, db_msg = save_to_db(entry["data"], verify=True)
+
+            if success:
+                success_count += 1
+                print(f"   ✅ [{entry['pdf_file']}] DB 저장 완료 (Parent ID: {db_msg})")
+                if journal is not None:
+                    record_outcome(journal, entry["pdf_full_path"], True, parent_idx=db_msg,
+                                   fingerprint=entry.get("fingerprint"))
+            else:
+                print(f"   ❌ [{entry['pdf_file']}] {db_msg}")
+                entry["error"] = db_msg
+                remaining.append(entry)
+    finally:
+        if journal is not None:
+            journal.close()
+
+        # 남은 문서만 다시 기록 (임시 파일에 쓴 뒤 교체)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in remaining + entries[success_count + len(remaining):]:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    return success_count, len(remaining)
+
+
+# 실행: python dead_letter.py <데드레터 파일>
+if __name__ == "__main__":
+
+    if len(sys.argv) != 2:
+        print("사용법: python dead_letter.py <데드레터 파일>")
+        sys.exit(1)
+
+    print(f"🔁 데드레터 재적재: {sys.argv[1]}")
+    success_count, remaining_count = replay_dead_letter(sys.argv[1])
+    print(f"✨ 재적재 완료: 성공 {success_count}건 / 남은 문서 {remaining_count}건")
+    if remaining_count:
+        sys.exit(1)
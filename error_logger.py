@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import time
+import atexit
+import datetime
+import threading
+
+try:
+    import fcntl  # 리눅스/맥에서만 사용 가능 (여러 프로세스가 같은 로그 파일에 쓸 때 잠금)
+except ImportError:
+    fcntl = None
+
+
+# 에러 로그 설정 (환경변수로 변경 가능)
+ERROR_LOG_CONFIG = {
+    # 로그 폴더 (error/error_<폴더명>.jsonl)
+    'dir': os.getenv('ERROR_LOG_DIR', 'error'),
+    # 이 시간(초)이 지나거나 flush_count 건이 모이면 파일에 기록
+    'flush_seconds': float(os.getenv('ERROR_LOG_FLUSH_SECONDS', 5)),
+    'flush_count': int(os.getenv('ERROR_LOG_FLUSH_COUNT', 100)),
+    # 파일 크기(MB)가 넘으면 .1, .2 ... 로 밀어내고 새 파일 시작
+    'max_mb': float(os.getenv('ERROR_LOG_MAX_MB', 50)),
+    # 보관할 이전 파일 수
+    'backups': int(os.getenv('ERROR_LOG_BACKUPS', 5)),
+}
+
+
+def get_error_log_path(main_folder):
+    return os.path.join(ERROR_LOG_CONFIG['dir'], f"error_{main_folder}.jsonl")
+
+
+class ErrorLogger:
+    """
+    에러를 JSON Lines 로 모아서 기록하는 객체.
+    기록은 메모리에 모았다가 한 번에 쓰고, 파일 잠금으로 여러 프로세스가 같은 파일에 써도 줄이 섞이지 않습니다.
+    다음 에러가 없어도 flush_seconds 뒤에 백그라운드 타이머가 남은 기록을 씁니다.
+    """
+
+    def __init__(self, main_folder):
+        self.path = get_error_log_path(main_folder)
+        self._buffer = []
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    # stage: 실패 단계 (parse / worker / db), duration: 해당 단계 소요 시간(초)
+    def log(self, sub_folder, filename, error_msg, stage=None, error_class=None, duration=None):
+        record = {
+            "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid(),
+            "file": f"{sub_folder}/{filename}",
+            "stage": stage,
+            "error_class": error_class,
+            "duration": round(duration, 3) if duration is not None else None,
+            "error": str(error_msg),
+        }
+
+        with self._lock:
+            self._buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+            due = (len(self._buffer) >= ERROR_LOG_CONFIG['flush_count']
+                   or time.time() - self._last_flush >= ERROR_LOG_CONFIG['flush_seconds'])
+            if not due and self._timer is None:
+                self._timer = threading.Timer(ERROR_LOG_CONFIG['flush_seconds'], self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+            self._last_flush = time.time()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not buffer:
+            return
+
+        log_dir = os.path.dirname(self.path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
+
+        # 잠금 파일 기준으로 크기 확인/교체/추가를 한 번에 처리
+        with open(self.path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._rotate_if_needed()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(buffer))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # 크기 초과 시 error_x.jsonl → .1 → .2 ... 로 밀어내기 (가장 오래된 파일은 삭제)
+    def _rotate_if_needed(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < ERROR_LOG_CONFIG['max_mb'] * 1024 * 1024:
+            return
+
+        backups = ERROR_LOG_CONFIG['backups']
+        oldest = f"{self.path}.{backups}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for idx in range(backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{idx}"):
+                os.replace(f"{self.path}.{idx}", f"{self.path}.{idx + 1}")
+        if backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+# 폴더별 로거 (프로세스 종료 시 남은 기록 저장)
+_loggers = {}
+
+
+def get_error_logger(main_folder):
+    logger = _loggers.get(main_folder)
+    if logger is None:
+        logger = _loggers[main_folder] = ErrorLogger(main_folder)
+    return logger
+
+
+def flush_error_logs():
+    for logger in list(_loggers.values()):
+        logger.flush()
+
+
+# fork 로 만든 워커 프로세스: 부모의 기록/타이머/잠금 상태는 물려받지 않음 (부모가 직접 기록)
+def _reset_after_fork():
+    for logger in _loggers.values():
+        logger._buffer = []
+        logger._lock = threading.Lock()
+        logger._timer = None
+
+
+atexit.register(flush_error_logs)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# 에러 로그 요약 (현재 파일 + 교체된 이전 파일, 반환: 단계별/에러 종류별 건수, 자주 나온 에러 메시지)
+def summarize_error_log(main_folder, top_n=10):
+    path = get_error_log_path(main_folder)
+    paths = [path] + [f"{path}.{idx}" for idx in range(1, ERROR_LOG_CONFIG['backups'] + 1)]
+
+    summary = {"total": 0, "files": set(), "by_stage": {}, "by_error_class": {}, "messages": {}, "duration": 0.0}
+    for log_path in paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                summary["total"] += 1
+                summary["files"].add(record["file"])
+                summary["by_stage"][record["stage"]] = summary["by_stage"].get(record["stage"], 0) + 1
+                summary["by_error_class"][record["error_class"]] = \
+                    summary["by_error_class"].get(record["error_class"], 0) + 1
+                message = record["error"][:100]
+                summary["messages"][message] = summary["messages"].get(message, 0) + 1
+                summary["duration"] += record["duration"] or 0.0
+
+    summary["files"] = len(summary["files"])
+    summary["messages"] = sorted(summary["messages"].items(), key=lambda x: -x[1])[:top_n]
+    return summary
+
+
+# 실행: python error_logger.py <폴더명>
+if __name__ == "__main__":
+
+    if len(sys.argv) != 2:
+        print("사용법: python error_logger.py <폴더명>")
+        sys.exit(1)
+
+    summary = summarize_error_log(sys.argv[1])
+
+    print(f"📋 에러 로그 요약: {get_error_log_path(sys.argv[1])}\n" + "=" * 45)
+    print(f"전체 {summary['total']}건 / 파일 {summary['files']}개 / 소요 시간 합계 {summary['duration']:.1f}초")
+    print("단계별: " + " / ".join(f"{k} {v}건" for k, v in sorted(summary["by_stage"].items(), key=lambda x: -x[1])))
+    print("에러 종류별: " + " / ".join(f"{k} {v}건" for k, v in
+                                    sorted(summary["by_error_class"].items(), key=lambda x: -x[1])))
+    print("자주 나온 에러:")
+    for message, count in summary["messages"]:
+        print(f"   - {count}건: {message}")
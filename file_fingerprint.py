@@ -0,0 +1,31 @@
+import os
+import hashlib
+
+
+# 해시 계산 시 한 번에 읽을 크기 (파일 전체를 메모리에 올리지 않음)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# 빠른 비교용 파일 정보 (크기, 수정시각)
+def get_file_stat(file_path):
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+# 파일 내용 SHA-256 (스트리밍 방식)
+def get_file_sha256(file_path, chunk_size=HASH_CHUNK_SIZE):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# 파일 지문 (크기 + 수정시각 + SHA-256)
+def get_file_fingerprint(file_path):
+    file_size, file_mtime_ns = get_file_stat(file_path)
+    return {
+        "file_size": file_size,
+        "file_mtime_ns": file_mtime_ns,
+        "sha256": get_file_sha256(file_path),
+    }
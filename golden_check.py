@@ -0,0 +1,152 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+from module_test_parsing import pdf_maegak_parsing
+
+
+# 골든 결과 대상 폴더
+GOLDEN_FOLDERS = ["test_pdf", "test_251219"]
+
+# 골든 결과 저장 폴더 (golden/<폴더>/<파일명>.json)
+GOLDEN_DIR = "golden"
+
+# 파일별 시간 예산 (golden/budgets.json, 갱신 시 측정값 x 배수, 최소값 보장)
+BUDGET_PATH = os.path.join(GOLDEN_DIR, "budgets.json")
+BUDGET_FACTOR = 3.0
+BUDGET_MIN_SECONDS = 2.0
+
+# 비교에서 제외하는 필드 (실행 환경마다 달라지는 값)
+IGNORE_FIELDS = {"pdf_path", "_metrics"}
+
+
+def get_golden_path(pdf_path):
+    folder = os.path.basename(os.path.dirname(pdf_path))
+    file_name = os.path.splitext(os.path.basename(pdf_path))[0] + ".json"
+    return os.path.join(GOLDEN_DIR, folder, file_name)
+
+
+# 골든 저장용 결과 (비교 제외 필드 제거)
+def to_golden(result):
+    return {k: v for k, v in result.items() if k not in IGNORE_FIELDS}
+
+
+# 필드별 차이 목록 (점유자/회차는 항목 단위로 비교)
+def diff_result(expected, actual):
+    diffs = []
+
+    for field in sorted(set(expected) | set(actual)):
+        exp_val = expected.get(field)
+        act_val = actual.get(field)
+        if exp_val == act_val:
+            continue
+
+        if field == "occupants" and isinstance(exp_val, dict) and isinstance(act_val, dict):
+            for name in sorted(set(exp_val) | set(act_val)):
+                if exp_val.get(name) != act_val.get(name):
+                    diffs.append(f"occupants[{name}]: {exp_val.get(name)} → {act_val.get(name)}")
+        elif field == "auction_rounds" and isinstance(exp_val, list) and isinstance(act_val, list):
+            for idx in range(max(len(exp_val), len(act_val))):
+                exp_round = exp_val[idx] if idx < len(exp_val) else None
+                act_round = act_val[idx] if idx < len(act_val) else None
+                if exp_round != act_round:
+                    diffs.append(f"auction_rounds[{idx}]: {exp_round} → {act_round}")
+        else:
+            diffs.append(f"{field}: {exp_val!r} → {act_val!r}")
+
+    return diffs
+
+
+def load_budgets():
+    if not os.path.exists(BUDGET_PATH):
+        return {}
+    with open(BUDGET_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    json_dir = os.path.dirname(path)
+    if json_dir and not os.path.exists(json_dir):
+        os.makedirs(json_dir)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+# 골든 결과 갱신 (현재 파서 결과를 기준으로 저장)
+def update_golden(pdf_files, backend):
+    budgets = {}
+
+    for pdf_path in pdf_files:
+        start = time.perf_counter()
+        result = pdf_maegak_parsing(pdf_path, backend=backend)
+        elapsed = time.perf_counter() - start
+
+        save_json(get_golden_path(pdf_path), to_golden(result))
+        budgets[pdf_path.replace(os.sep, "/")] = round(max(BUDGET_MIN_SECONDS, elapsed * BUDGET_FACTOR), 2)
+        print(f"   💾 {get_golden_path(pdf_path)} ({elapsed:.3f}s)")
+
+    save_json(BUDGET_PATH, budgets)
+
+
+# 골든 결과와 비교 (반환값: 실패 건수)
+def check_golden(pdf_files, backend):
+    budgets = load_budgets()
+    fail_count = 0
+
+    for pdf_path in pdf_files:
+        golden_path = get_golden_path(pdf_path)
+        if not os.path.exists(golden_path):
+            print(f"   ⚠️ {pdf_path}: 골든 결과 없음 ({golden_path})")
+            fail_count += 1
+            continue
+
+        with open(golden_path, encoding="utf-8") as f:
+            expected = json.load(f)
+
+        start = time.perf_counter()
+        result = pdf_maegak_parsing(pdf_path, backend=backend)
+        elapsed = time.perf_counter() - start
+
+        errors = diff_result(expected, to_golden(result))
+
+        budget = budgets.get(pdf_path.replace(os.sep, "/"))
+        if budget is not None and elapsed > budget:
+            errors.append(f"시간 예산 초과: {elapsed:.3f}s > {budget:.2f}s")
+
+        if errors:
+            fail_count += 1
+            print(f"   ❌ {pdf_path} ({elapsed:.3f}s)")
+            for error in errors:
+                print(f"      - {error}")
+        else:
+            print(f"   ✅ {pdf_path} ({elapsed:.3f}s)")
+
+    return fail_count
+
+
+# 실행
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="매각물건명세서 파싱 골든 결과 비교")
+    parser.add_argument("--update", action="store_true", help="현재 결과로 골든 결과/시간 예산 갱신")
+    parser.add_argument("--backend", default=None, help="PDF 백엔드 (pdfplumber / fitz)")
+    args = parser.parse_args()
+
+    pdf_files = sorted(f for folder in GOLDEN_FOLDERS for f in glob.glob(os.path.join(folder, "*.pdf")))
+
+    print(f"🔍 골든 결과 {'갱신' if args.update else '비교'}: {len(pdf_files)}개 파일\n" + "=" * 45)
+
+    if args.update:
+        update_golden(pdf_files, args.backend)
+        print("✨ 골든 결과 갱신 완료")
+    else:
+        fail_count = check_golden(pdf_files, args.backend)
+        print("=" * 45)
+        if fail_count:
+            print(f"❌ {fail_count}개 파일 불일치")
+            sys.exit(1)
+        print("✨ 전체 일치")
@@ -1,27 +1,24 @@
 import os
-from db_manager import get_db_connection
-import pdfplumber
+from db_manager import pooled_connection, rollback_quietly
+from db_retry import run_with_retry, commit_checked
+from error_logger import get_error_logger
+from parse_metrics import METRICS_CONFIG, new_metrics, measure, iter_measured_pages, record_page_tables, finish_metrics
+from pdf_backends import open_pdf_pages
+from table_strategy import choose_table_strategy, record_strategy_result, STRATEGY_LINES, STRATEGY_TEXT, STRATEGY_NONE
 import re
+import numpy as np
 import pandas as pd
-import datetime
 import json
 import time
+import hashlib
+from contextlib import ExitStack
+from functools import cached_property, lru_cache
 
-def write_error_log(main_folder, sub_folder, filename, error_msg):
+def write_error_log(main_folder, sub_folder, filename, error_msg, stage=None, error_class=None, duration=None):
     """
-    에러 발생 시 error/error_{main_folder}.txt 파일에 기록합니다.
+    에러 발생 시 error/error_{main_folder}.jsonl 파일에 기록합니다. (모아서 주기적으로 기록)
     """
-    error_dir = "error"
-    if not os.path.exists(error_dir):
-        os.makedirs(error_dir)
-    print('main_folder', main_folder)
-    log_file_path = os.path.join(error_dir, f"error_{main_folder}.txt")
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] File: {sub_folder}/{filename}\n")
-        f.write(f"Error: {error_msg}\n")
-        f.write("-" * 50 + "\n")
+    get_error_logger(main_folder).log(sub_folder, filename, error_msg, stage, error_class, duration)
 
 
 # DB 데이터 정제
@@ -36,87 +33,241 @@ def clean_special_chars(val):
     cleaned = val.replace('\u2024', '.').replace('\u00a0', ' ')
     return cleaned.strip()
 
-# DB 저장
-def save_to_db(data):
-    # 공통 함수를 호출하여 연결 객체 생성
-    conn = get_db_connection()
-    if not conn:
-        return False, "DB Connection Error"
-
-    cursor = conn.cursor()
-    try:
-        # print('save_to_db', data)
-
-        # 매각물건번호 정수형으로 전환
-        item_no = int(data['item_no']) if str(data['item_no']).isdigit() else None
-
-        # 매각 테이블에 추가
-        master_sql = """
-                    INSERT INTO tmp_maegak (
-                        case_no, item_no, priority_date, dividend_end_date, document_date,
-                        tenant_note, surviving_rights, surface_right_summary, general_note,
-                        pdf_file_path
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-        cursor.execute(master_sql, (
-            clean_special_chars(data['case_no']), item_no, clean_special_chars(data['priority_date']),
-            clean_special_chars(data['dividend_end_date']), clean_special_chars(data['document_date']),
-            clean_special_chars(data['tenant_note']), clean_special_chars(data['surviving_rights']),
-            clean_special_chars(data['surface_right_summary']), clean_special_chars(data['general_note']),
-            clean_special_chars(data['pdf_path'])
-        ))
-
-        # 생성된 PK 가져오기
+# DB 저장 설정 (환경변수로 변경 가능)
+SAVE_CONFIG = {
+    # 중복 방지 모드: (사건번호, 물건번호, 작성일자)가 같은 문서는 새로 INSERT 하지 않고 갱신/생략
+    # 필요 스키마:
+    #   ALTER TABLE tmp_maegak ADD COLUMN content_hash CHAR(64) NULL,
+    #       ADD UNIQUE KEY uk_tmp_maegak_doc (case_no, item_no, document_date);
+    'upsert': os.getenv('DB_UPSERT', '0') == '1',
+}
+
+# 중복 방지 모드 처리 건수 (신규 / 변경 / 변경 없음)
+UPSERT_STATS = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+# 매각 테이블 INSERT
+MASTER_INSERT_SQL = """
+    INSERT INTO tmp_maegak (
+        case_no, item_no, priority_date, dividend_end_date, document_date,
+        tenant_note, surviving_rights, surface_right_summary, general_note,
+        pdf_file_path
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# 회차 정보 테이블 INSERT (executemany 시 여러 행을 한 번에 전송)
+ROUNDS_INSERT_SQL = """
+    INSERT INTO tmp_maegak_rounds (
+        parent_idx, round_no, auction_date, min_bid_price, bid_deposit
+    ) VALUES (%s, %s, %s, %s, %s)
+"""
+
+# 점유자 정보 테이블 INSERT (executemany 시 여러 행을 한 번에 전송)
+OCCUPANTS_INSERT_SQL = """
+    INSERT INTO tmp_maegak_occupants (
+        parent_idx, name, unit, info_source, occupancy_type,
+        move_in_date, confirmed_date, dividend_claim_date, deposit, rent
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+# 중복 방지 모드 SQL
+MASTER_SELECT_BY_KEY_SQL = """
+    SELECT idx, content_hash FROM tmp_maegak
+    WHERE case_no <=> %s AND item_no <=> %s AND document_date <=> %s
+    FOR UPDATE
+"""
+
+MASTER_UPDATE_SQL = """
+    UPDATE tmp_maegak SET
+        case_no = %s, item_no = %s, priority_date = %s, dividend_end_date = %s, document_date = %s,
+        tenant_note = %s, surviving_rights = %s, surface_right_summary = %s, general_note = %s,
+        pdf_file_path = %s, content_hash = %s
+    WHERE idx = %s
+"""
+
+# 커밋 여부를 모르는 재시도용: 같은 내용의 매각 행이 이미 저장됐는지 확인
+MASTER_SELECT_SAVED_SQL = """
+    SELECT idx FROM tmp_maegak
+    WHERE case_no <=> %s AND item_no <=> %s AND priority_date <=> %s AND dividend_end_date <=> %s
+      AND document_date <=> %s AND tenant_note <=> %s AND surviving_rights <=> %s
+      AND surface_right_summary <=> %s AND general_note <=> %s AND pdf_file_path <=> %s
+    ORDER BY idx DESC LIMIT 1
+"""
+
+MASTER_SET_HASH_SQL = "UPDATE tmp_maegak SET content_hash = %s WHERE idx = %s"
+ROUNDS_DELETE_SQL = "DELETE FROM tmp_maegak_rounds WHERE parent_idx = %s"
+OCCUPANTS_DELETE_SQL = "DELETE FROM tmp_maegak_occupants WHERE parent_idx = %s"
+
+
+# 매각 테이블 저장값
+def build_master_row(data):
+    # 매각물건번호 정수형으로 전환
+    item_no = int(data['item_no']) if str(data['item_no']).isdigit() else None
+
+    return (
+        clean_special_chars(data['case_no']), item_no, clean_special_chars(data['priority_date']),
+        clean_special_chars(data['dividend_end_date']), clean_special_chars(data['document_date']),
+        clean_special_chars(data['tenant_note']), clean_special_chars(data['surviving_rights']),
+        clean_special_chars(data['surface_right_summary']), clean_special_chars(data['general_note']),
+        clean_special_chars(data['pdf_path'])
+    )
+
+
+# 회차 정보 테이블 저장값 목록
+def build_round_rows(parent_idx, auction_rounds):
+    rows = []
+    for r in auction_rounds or []:
+        # '1회' -> 1 숫자만 추출
+        round_num = int(re.sub(r'[^0-9]', '', r['round_no'])) if r['round_no'] else 0
+        # 가격 데이터 콤마/공백 제거 후 숫자로 변환
+        min_price = int(re.sub(r'[^0-9]', '', r['min_bid_price'])) if r['min_bid_price'] else 0
+        deposit = int(re.sub(r'[^0-9]', '', r['bid_deposit'])) if r['bid_deposit'] else 0
+
+        rows.append((parent_idx, round_num, clean_special_chars(r['auction_date']), min_price, deposit))
+    return rows
+
+
+# 점유자 정보 테이블 저장값 목록
+def build_occupant_rows(parent_idx, occupants):
+    rows = []
+    for name, details_list in (occupants or {}).items():
+        for d in details_list:
+            rows.append((
+                parent_idx,
+                clean_special_chars(name),
+                clean_special_chars(d['unit']),
+                clean_special_chars(d['info_source']),
+                clean_special_chars(d['occupancy_type']),
+                clean_special_chars(d['move_in_date']),
+                clean_special_chars(d['confirmed_date']),
+                clean_special_chars(d['dividend_claim_date']),
+                clean_special_chars(d['deposit']),
+                clean_special_chars(d['rent'])
+            ))
+    return rows
+
+
+# 문서 내용 해시 (저장되는 값 기준, 파일 경로는 제외)
+def get_content_hash(master_row, round_rows, occupant_rows):
+    content = [master_row[:-1], [row[1:] for row in round_rows], [row[1:] for row in occupant_rows]]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+# 자식 테이블 저장 (회차 / 점유자) - 여러 행을 INSERT 1번으로
+def insert_child_rows(cursor, round_rows, occupant_rows):
+    if round_rows:
+        cursor.executemany(ROUNDS_INSERT_SQL, round_rows)
+    if occupant_rows:
+        cursor.executemany(OCCUPANTS_INSERT_SQL, occupant_rows)
+
+
+# 중복 방지 모드 저장 (트랜잭션 안에서 실행, 반환: (parent_idx, 처리 구분))
+# 같은 문서가 없으면 INSERT, 내용이 바뀌었으면 매각 행 갱신 + 자식 행 교체, 같으면 아무것도 쓰지 않음
+def upsert_document(cursor, data):
+    return upsert_rows(cursor, build_master_row(data), build_round_rows(None, data['auction_rounds']),
+                       build_occupant_rows(None, data['occupants']))
+
+
+# 중복 방지 모드 저장 (저장값 기준, 자식 행의 첫 값(parent_idx)은 사용하지 않음 - SQLite 병합에서도 사용)
+def upsert_rows(cursor, master_row, round_rows, occupant_rows):
+    content_hash = get_content_hash(master_row, round_rows, occupant_rows)
+
+    # (사건번호, 물건번호, 작성일자)로 기존 문서 조회
+    cursor.execute(MASTER_SELECT_BY_KEY_SQL, (master_row[0], master_row[1], master_row[4]))
+    existing = cursor.fetchone()
+
+    if existing and existing[1] == content_hash:
+        return existing[0], "unchanged"
+
+    if existing:
+        parent_idx = existing[0]
+        cursor.execute(MASTER_UPDATE_SQL, master_row + (content_hash, parent_idx))
+        cursor.execute(ROUNDS_DELETE_SQL, (parent_idx,))
+        cursor.execute(OCCUPANTS_DELETE_SQL, (parent_idx,))
+        action = "updated"
+    else:
+        cursor.execute(MASTER_INSERT_SQL, master_row)
         parent_idx = cursor.lastrowid
+        cursor.execute(MASTER_SET_HASH_SQL, (content_hash, parent_idx))
+        action = "inserted"
+
+    insert_child_rows(cursor,
+                      [(parent_idx,) + row[1:] for row in round_rows],
+                      [(parent_idx,) + row[1:] for row in occupant_rows])
+    return parent_idx, action
+
+
+# 중복 방지 모드 처리 건수 반환 후 초기화
+def pop_upsert_stats():
+    stats = dict(UPSERT_STATS)
+    for k in UPSERT_STATS:
+        UPSERT_STATS[k] = 0
+    return stats
+
+
+# 같은 내용의 매각 행이 이미 저장되어 있으면 그 parent_idx (없으면 None)
+# 커밋 중 연결이 끊긴 뒤 재시도할 때만 사용 (이전 시도가 커밋됐으면 다시 저장하지 않음)
+def find_saved_master(cursor, master_row):
+    cursor.execute(MASTER_SELECT_SAVED_SQL, master_row)
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+# 문서 1건 추가 (매각 + 회차 + 점유자, 반환: parent_idx)
+def insert_document(cursor, data):
+    # 매각 테이블에 추가
+    cursor.execute(MASTER_INSERT_SQL, build_master_row(data))
+
+    # 생성된 PK 가져오기
+    parent_idx = cursor.lastrowid
+
+    # 회차 정보 / 점유자 정보 저장
+    insert_child_rows(cursor,
+                      build_round_rows(parent_idx, data['auction_rounds']),
+                      build_occupant_rows(parent_idx, data['occupants']))
+    return parent_idx
 
-        # 회차 정보 테이블 (temp_maegak_rounds) 저장
-        if data['auction_rounds']:
-            rounds_sql = """
-                        INSERT INTO tmp_maegak_rounds (
-                            parent_idx, round_no, auction_date, min_bid_price, bid_deposit
-                        ) VALUES (%s, %s, %s, %s, %s)
-                    """
-            for r in data['auction_rounds']:
-                # '1회' -> 1 숫자만 추출
-                round_num = int(re.sub(r'[^0-9]', '', r['round_no'])) if r['round_no'] else 0
-                # 가격 데이터 콤마/공백 제거 후 숫자로 변환
-                min_price = int(re.sub(r'[^0-9]', '', r['min_bid_price'])) if r['min_bid_price'] else 0
-                deposit = int(re.sub(r'[^0-9]', '', r['bid_deposit'])) if r['bid_deposit'] else 0
-
-                cursor.execute(rounds_sql, (parent_idx, round_num, clean_special_chars(r['auction_date']), min_price, deposit))
-
-        # 점유자 정보 저장
-        if data['occupants']:
-            occ_sql = """
-                        INSERT INTO tmp_maegak_occupants (
-                            parent_idx, name, unit, info_source, occupancy_type,
-                            move_in_date, confirmed_date, dividend_claim_date, deposit, rent
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """
-            for name, details_list in data['occupants'].items():
-                for d in details_list:
-                    cursor.execute(occ_sql, (
-                        parent_idx,
-                        clean_special_chars(name),
-                        clean_special_chars(d['unit']),
-                        clean_special_chars(d['info_source']),
-                        clean_special_chars(d['occupancy_type']),
-                        clean_special_chars(d['move_in_date']),
-                        clean_special_chars(d['confirmed_date']),
-                        clean_special_chars(d['dividend_claim_date']),
-                        clean_special_chars(d['deposit']),
-                        clean_special_chars(d['rent'])
-                    ))
-
-        conn.commit()
-
-
-        return True, parent_idx
+
+# DB 저장 (upsert: 중복 방지 모드 사용 여부, 기본값은 SAVE_CONFIG)
+# 데드락/락 대기 초과/연결 끊김은 잠시 후 다시 시도 (커밋 중 끊긴 경우는 저장 여부를 확인한 뒤 없을 때만 저장)
+# verify: 이전 저장의 커밋 여부를 모르는 경우 처음부터 저장 여부 확인 후 저장 (묶음 저장 실패 후 재저장, 데드레터 재적재)
+def save_to_db(data, upsert=None, verify=False):
+    if upsert is None:
+        upsert = SAVE_CONFIG['upsert']
+
+    try:
+        return True, run_with_retry(write_document, data, upsert, verify=verify)
     except Exception as e:
-        conn.rollback()
         return False, str(e)
-    finally:
-        conn.close()
+
+
+# 문서 1건을 한 트랜잭션으로 저장 (반환: parent_idx, 실패 시 롤백 후 에러 발생)
+# verify: 이전 시도의 커밋 여부를 모르는 재시도 (같은 내용이 이미 있으면 추가하지 않음)
+def write_document(data, upsert, verify=False):
+    # 커넥션 풀에서 연결 객체를 빌려서 사용 (블록이 끝나면 반납)
+    with pooled_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB Connection Error")
+
+        cursor = conn.cursor()
+        try:
+            action = None
+            if upsert:
+                # 중복 방지 모드는 조회 후 저장하므로 verify 와 관계없이 다시 실행해도 중복되지 않음
+                parent_idx, action = upsert_document(cursor, data)
+            else:
+                parent_idx = find_saved_master(cursor, build_master_row(data)) if verify else None
+                if parent_idx is None:
+                    parent_idx = insert_document(cursor, data)
+
+            commit_checked(conn)
+            if action:
+                UPSERT_STATS[action] += 1
+
+            return parent_idx
+        except Exception:
+            rollback_quietly(conn)
+            raise
 
 
 # \n -> 한 칸 띄어씌기로 변경 함수
@@ -128,54 +279,131 @@ def line_change_no_spacing_val(val):
     return str(val).replace('\n', '').strip() if val else ""
 
 
+# 셀 배열 문자열 치환 (np.strings.replace 는 빈 배열에서 에러가 나므로 그대로 반환)
+def replace_cells(values, old, new):
+    return np.strings.replace(values, old, new) if values.size else values
+
+
+# 추출된 표 1개 (DataFrame 변환은 1번만 하고 정제된 셀/행 텍스트를 처음 쓸 때 만들어 각 섹션 추출에서 같이 사용)
+# 빈 칸(None / NaN)은 열 종류와 관계없이 모두 "" 로 처리
+class ParsedTable:
+
+    def __init__(self, table):
+        self.df = pd.DataFrame(table)
+        self.empty = self.df.empty
+        self.width = len(self.df.columns)
+
+    # 빈 칸(None / NaN) → "", 나머지는 문자열로 (2차원 배열)
+    @cached_property
+    def _text_values(self):
+        values = self.df.to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = ""
+        return values.astype(str)
+
+    # line_change_spacing_val 적용한 셀 (행 목록)
+    @cached_property
+    def spaced_rows(self):
+        return np.strings.strip(replace_cells(self._text_values, '\n', ' ')).tolist()
+
+    # 모든 공백과 줄바꿈을 제거한 셀 (키워드 비교용, 행 목록)
+    @cached_property
+    def compact_rows(self):
+        return replace_cells(replace_cells(self._text_values, ' ', ''), '\n', '').tolist()
+
+    # 행 전체 텍스트 (셀을 공백으로 연결)
+    @cached_property
+    def row_texts(self):
+        return [" ".join(row) for row in self.spaced_rows]
+
+    # 점유자 표용 정제 셀: 줄바꿈(\\n 문자 포함) → 공백, 앞뒤 공백 제거 (2차원 배열)
+    @cached_property
+    def cells(self):
+        values = replace_cells(self._text_values, '\\n', ' ')
+        return np.strings.strip(replace_cells(values, '\n', ' '))
+
+
+# 표 원본(list of list)이 들어오면 ParsedTable 로 변환
+def to_parsed_table(table):
+    return table if isinstance(table, ParsedTable) else ParsedTable(table)
+
+
+# 기본사건정보 항목 (결과 키: 키워드, 키워드가 있는 칸 다음의 값을 가져옴)
+HEADER_KEYWORDS = {
+    "case_no": "사건",  # 사건번호
+    "item_no": "물건번호",  # 매각물건번호
+    "document_date": "작성 일자",  # 작성일자
+    "priority_date": "최선순위",  # 최선순위 설정
+    "dividend_end_date": "배당요구종기",  # 배당요구종기
+}
+
+
+# 키워드 목록 컴파일 (키워드 목록마다 1번만, 반환: (공백 제거한 키워드 목록, 키워드 중 하나라도 찾는 정규식))
+@lru_cache(maxsize=None)
+def compile_keywords(keywords):
+    targets = tuple((keyword, keyword.replace(" ", "")) for keyword in keywords)
+    pattern = re.compile("|".join(re.escape(target) for _, target in targets))
+    return targets, pattern
+
+
+# 키워드 색인 (표를 1번만 훑어서 키워드별 (행, 열, 다음 값) 기록, 반환: 키워드 → 색인)
+# 키워드가 있는 칸 중 오른쪽에 값이 있는 첫 칸 기준 (셀/키워드 모두 공백과 줄바꿈 제거 후 비교)
+def build_keyword_index(table, keywords):
+    # 키워드가 하나도 없는 칸은 정규식 1번으로 건너뜀
+    targets, pattern = compile_keywords(tuple(keywords))
+    index = {}
+
+    for row_idx, (compact_row, spaced_row) in enumerate(zip(table.compact_rows, table.spaced_rows)):
+        next_values = None
+        for col_idx, clean_cell in enumerate(compact_row):
+            if not pattern.search(clean_cell):
+                continue
+
+            # 칸마다 오른쪽 첫 값 (행에서 처음 필요할 때 1번만 계산)
+            if next_values is None:
+                next_values = [""] * len(spaced_row)
+                next_val = ""
+                for idx in range(len(spaced_row) - 1, -1, -1):
+                    next_values[idx] = next_val
+                    if spaced_row[idx]:
+                        next_val = spaced_row[idx]
+
+            for keyword, target in targets:
+                if keyword not in index and target in clean_cell and next_values[col_idx]:
+                    index[keyword] = {"row": row_idx, "col": col_idx, "value": next_values[col_idx]}
+
+        if len(index) == len(targets):
+            break
+
+    return index
+
+
 # 키워드 다음의 값 찾기 (사건번호, 매각물건번호, 작성일자, 최선순위 설정, 배당요구종기)
-def get_value_next_keyword(df, keyword):
-    target_keyword = keyword.replace(" ", "")
-    for i in range(len(df)):
-        row = df.iloc[i].tolist()
-        for col_idx, cell_val in enumerate(row):
-            if cell_val:
-                # 셀 데이터에서도 모든 공백과 줄바꿈을 제거 후 비교
-                clean_cell = str(cell_val).replace(" ", "").replace("\n", "")
-                if target_keyword in clean_cell:
-                    # 키워드를 찾았으면 그 다음 칸부터 실제 데이터가 있는 곳 탐색
-                    for next_idx in range(col_idx + 1, len(row)):
-                        next_val = line_change_spacing_val(row[next_idx])
-                        if next_val:
-                            return next_val
-    return ""
+def get_value_next_keyword(table, keyword):
+    entry = build_keyword_index(to_parsed_table(table), [keyword]).get(keyword)
+    return entry["value"] if entry else ""
 
 
 # 기본사건정보(Header) 가져오기
 def get_default_case_data(table):
     try:
 
-        # 테이블을 데이터프레임으로 변환
-        df = pd.DataFrame(table)
+        # 테이블 정제 (pdf_maegak_parsing 에서 만든 ParsedTable 은 그대로 사용)
+        table = to_parsed_table(table)
 
         # 데이터가 없는 경우 스킵
-        if df.empty:
+        if table.empty:
             return None
 
         # 결과 데이터
         result = {}
 
-        if len(df.columns) >= 10:
-
-            # 사건번호
-            result["case_no"] = get_value_next_keyword(df, "사건")
-
-            # 매각물건번호
-            result["item_no"] = get_value_next_keyword(df, "물건번호")
-
-            # 작성일자
-            result["document_date"] = get_value_next_keyword(df, "작성 일자")
+        if table.width >= 10:
 
-            # 최선순위 설정
-            result["priority_date"] = get_value_next_keyword(df, "최선순위")
-
-            # 배당요구종기
-            result["dividend_end_date"] = get_value_next_keyword(df, "배당요구종기")
+            # 사건번호 / 매각물건번호 / 작성일자 / 최선순위 설정 / 배당요구종기 (표를 1번만 훑음)
+            keyword_index = build_keyword_index(table, HEADER_KEYWORDS.values())
+            for key, keyword in HEADER_KEYWORDS.items():
+                entry = keyword_index.get(keyword)
+                result[key] = entry["value"] if entry else ""
 
         return result
 
@@ -184,15 +412,111 @@ def get_default_case_data(table):
         return None
 
 
+# 점유자 표 항목 (mapping 키 → 결과 키)
+OCCUPANT_FIELDS = {
+    "점유부분": "unit",
+    "정보출처": "info_source",
+    "점유의권원": "occupancy_type",
+    "임대차기간": None,  # 현재 스키마에 없음
+    "보증금": "deposit",
+    "차임": "rent",
+    "전입신고": "move_in_date",
+    "확정일자": "confirmed_date",
+    "배당요구": "dividend_claim_date",
+}
+
+# 점유자 머리글 행 판별 (이 단어가 들어 있는 행은 건너뜀)
+OCCUPANT_HEADER_PATTERN = re.compile("성명|점유부분|정보출처")
+
+# 표 칸 수별 점유자 열 위치 (항목: 열 번호 목록, 앞 열이 비어 있으면 다음 열 사용)
+OCCUPANT_LAYOUTS = {
+    # case1: 1페이지에 <비고>가 없고 점유자 리스트가 1페이지에 다 있는 경우 (1010-1915009_1)
+    14: {"점유부분": (2,), "정보출처": (3,), "점유의권원": (5,), "임대차기간": (6,), "보증금": (7,), "차임": (10,),
+         "전입신고": (11,), "확정일자": (12,), "배당요구": (13,)},
+    # case3: 칸이 15줄인경우 1010-2303787_1.pdf
+    15: {"점유부분": (2,), "정보출처": (3,), "점유의권원": (5,), "임대차기간": (6,), "보증금": (8,), "차임": (10, 11),
+         "전입신고": (12,), "확정일자": (13,), "배당요구": (14,)},
+    # case2: 1페이지에 <비고>가 없고 점유자 리스트가 여러 페이지에 있는 경우 (2433827_1)
+    16: {"점유부분": (2,), "정보출처": (3,), "점유의권원": (5,), "임대차기간": (6,), "보증금": (8,), "차임": (11,),
+         "전입신고": (13,), "확정일자": (14,), "배당요구": (15,)},
+    # case2-1: 위 case2 에서 1페이지가 아닌 경우 (머리글 없이 이어지는 표, 2433827_1)
+    10: {"점유부분": (1,), "정보출처": (2,), "점유의권원": (3,), "임대차기간": (4,), "보증금": (5,), "차임": (6,),
+         "전입신고": (7,), "확정일자": (8,), "배당요구": (9,)},
+}
+
+# 칸 수별 추가 처리 (case1 은 보증금 콤마 제거)
+OCCUPANT_COMMA_FIELDS = {14: {"보증금"}}
+
+# 이어지는 표(머리글 없음) 칸 수: 페이지가 바뀌면서 이전 점유자와 연결된 행 처리
+OCCUPANT_CONTINUATION_WIDTH = 10
+
+
+# 점유자 표 열 계획 (표마다 1번만 계산)
+# 알려진 칸 수는 OCCUPANT_LAYOUTS, 처음 보는 칸 수는 머리글 행(성명/점유부분/정보출처/…/배당요구)에서 열 위치를 찾음
+# known_plans: 앞 표에서 머리글로 찾은 계획 (칸 수 → 계획), 머리글 없이 이어지는 다음 페이지 표에 그대로 사용
+# 반환: 열 위치를 알 수 없으면 None
+def compile_occupant_plan(df, known_plans=None):
+    width = len(df.columns)
+    layout = OCCUPANT_LAYOUTS.get(width)
+
+    if layout is None:
+        layout = find_occupant_header_layout(df)
+        if not layout:
+            return known_plans.get(width) if known_plans is not None else None
+
+    comma_fields = OCCUPANT_COMMA_FIELDS.get(width, set())
+    plan = {
+        "fields": [(field, layout.get(field, ()), field in comma_fields) for field in OCCUPANT_FIELDS],
+        "columns": {field: cols[0] for field, cols in layout.items()},
+        "is_continuation": width == OCCUPANT_CONTINUATION_WIDTH,
+    }
+    if known_plans is not None and width not in OCCUPANT_LAYOUTS:
+        known_plans[width] = plan
+    return plan
+
+
+# 머리글 행에서 항목별 열 위치 찾기 (항목 이름이 3개 이상 있는 첫 행, 없으면 빈 계획)
+def find_occupant_header_layout(df):
+    for row in df.itertuples(index=False):
+        layout = {}
+        for col, cell in enumerate(row):
+            label = re.sub(r"\s", "", cell) if isinstance(cell, str) else ""
+            for field in OCCUPANT_FIELDS:
+                if field in label and field not in layout:
+                    layout[field] = (col,)
+                    break
+        if len(layout) >= 3:
+            return layout
+    return {}
+
+
+# 열 계획대로 항목별 값 가져오기 (열 단위, 반환: 항목 → 값 배열)
+def apply_occupant_plan(plan, cells):
+    mapping = {}
+    for field, cols, strip_comma in plan["fields"]:
+        if not cols:
+            mapping[field] = np.full(len(cells), "")
+            continue
+
+        # 앞 열이 비어 있으면 다음 열 값 사용
+        values = cells[:, cols[0]]
+        for col in cols[1:]:
+            values = np.where(values != "", values, cells[:, col])
+        mapping[field] = replace_cells(values, ',', '') if strip_comma else values
+    return mapping
+
+
 # 점유자 현황 가져오기
-def get_occupants(table, current_name, last_occupant, is_change_table_page):
+# occupant_plans: 문서 안에서 머리글로 찾은 열 계획 (칸 수 → 계획, 표가 바뀌어도 유지)
+def get_occupants(table, current_name, last_occupant, is_change_table_page, occupant_plans=None):
 
     try:
-        # 테이블을 데이터프레임으로 변환
-        df = pd.DataFrame(table)
+        # 테이블 정제 (pdf_maegak_parsing 에서 만든 ParsedTable 은 그대로 사용)
+        table = to_parsed_table(table)
+        df = table.df
 
         # 데이터가 없는 경우 스킵
-        if df.empty:
+        if table.empty:
             return None
 
         # 결과 데이터
@@ -214,134 +538,72 @@ def get_occupants(table, current_name, last_occupant, is_change_table_page):
             else:
                 end_idx = len(df)
 
+            # 열 계획 (표마다 1번)
+            plan = compile_occupant_plan(df, occupant_plans)
+            if plan is None:
+                # 열 위치를 모르는 표는 빈 점유자 행을 만들지 않고 건너뜀
+                print(f"⚠️ 점유자 표 열 위치를 찾을 수 없음 ({len(df.columns)}칸) - 건너뜀")
+                return result
+            columns = plan["columns"]
 
             # 점유자 데이터 파싱
             if start_idx != -1:
-                occ_df = df.iloc[start_idx:end_idx].copy()
-
-                for _, row in occ_df.iterrows():
-                    # 데이터 정제: None 제거 및 줄바꿈 처리
-                    row_list = [str(v).replace('\\n', ' ').replace('\n', ' ').strip() if v is not None else "" for v in
-                                row.tolist()]
-                    if not "".join(row_list) or any(k in "".join(row_list) for k in ["성명", "점유부분", "정보출처"]):
-                        continue
-
-                    # print("row_list", row_list, ", 길이 : ", len(row_list))
-                    # 점유자 이름 설정
-                    if row_list[0]:
-                        current_name = row_list[0]
-
-                    # 루프 시작 시점에 mapping 초기화
-                    mapping = {k: "" for k in ["점유부분", "정보출처", "점유의권원", "임대차기간", "보증금", "차임", "전입신고", "확정일자", "배당요구"]}
-
-                    # case1: 1페이지에 <비고>가 없고 점유자 리스트가 1페이지에 다 있는 경우 (1010-1915009_1)
-                    if len(row_list) == 14:
-                        # print("case1: 1페이지에 <비고>가 없고 점유자 리스트가 1페이지에 다 있는 경우 (1010-1915009_1)")
-
-                        mapping = {
-                            "점유부분": row_list[2],
-                            "정보출처": row_list[3],
-                            "점유의권원": row_list[5],
-                            "임대차기간": row_list[6],
-                            "보증금": row_list[7].replace(',', ''),
-                            "차임": row_list[10] if len(row_list) > 10 else "",
-                            "전입신고": row_list[11] if len(row_list) > 11 else "",
-                            "확정일자": row_list[12] if len(row_list) > 12 else "",
-                            "배당요구": row_list[13] if len(row_list) > 13 else "",
-                        }
-
-                    elif len(row_list) == 15:
-                        # print("case3: 칸이 15줄인경우 1010-2303787_1.pdf")
-
-                        mapping = {
-                            "점유부분": row_list[2],
-                            "정보출처": row_list[3],
-                            "점유의권원": row_list[5],
-                            "임대차기간": row_list[6],
-                            "보증금": row_list[8],
-                            "차임": row_list[10] if (len(row_list) > 10 and row_list[10] != "") else (
-                                row_list[11] if len(row_list) > 11 else ""),
-                            "전입신고": row_list[12] if len(row_list) > 12 else "",
-                            "확정일자": row_list[13] if len(row_list) > 13 else "",
-                            "배당요구": row_list[14] if len(row_list) > 14 else "",
-                        }
-
-                    elif len(row_list) == 16:
-                        # print("case2: 1페이지에 <비고>가 없고 점유자 리스트가 여러 페이지에 있는 경우 (2433827_1)")
-
-                        mapping = {
-                            "점유부분": row_list[2],
-                            "정보출처": row_list[3],
-                            "점유의권원": row_list[5],
-                            "임대차기간": row_list[6],
-                            "보증금": row_list[8],
-                            "차임": row_list[11],
-                            "전입신고": row_list[13],
-                            "확정일자": row_list[14],
-                            "배당요구": row_list[15],
-                        }
-
-                    elif len(row_list) == 10:
-                        # print("case2-1: 1페이지에 <비고>가 없고 점유자 리스트가 여러 페이지에 있는 경우 - 1페이지가 아닌 경우 (2433827_1)")
-
-                        # 페이지가 바뀌면서 위의 내용과 연결되어있는지 체크하고 이전 내용에 추가하는 부분
-                        # print("row_list", row_list, tablePageCheck, ((row_list[0]!= "" and row_list[2] == "")  or (row_list[0] == "" and row_list[2] == "")))
-
-                        if is_change_table_page and (
-                                (row_list[0] != "" and row_list[2] == "") or (row_list[0] == "" and row_list[2] == "")):
-                            is_change_table_page = False
-                            if last_occupant:
-                                last_occupant["name"] = (last_occupant["name"] + " " + row_list[0]).strip()
-                                last_occupant["unit"] = (last_occupant["unit"] + " " + row_list[1]).strip()
-                                last_occupant["info_source"] = (
-                                            last_occupant["info_source"] + " " + row_list[2]).strip()
-                                last_occupant["occupancy_type"] = (
-                                            last_occupant["occupancy_type"] + " " + row_list[3]).strip()
-                                last_occupant["move_in_date"] = (
-                                            last_occupant["move_in_date"] + " " + row_list[7]).strip()
-                                last_occupant["confirmed_date"] = (
-                                            last_occupant["confirmed_date"] + " " + row_list[8]).strip()
-                                last_occupant["dividend_claim_date"] = (
-                                            last_occupant["dividend_claim_date"] + " " + row_list[9]).strip()
-                                last_occupant["deposit"] = (last_occupant["deposit"] + " " + row_list[5]).strip()
-                                last_occupant["rent"] = (last_occupant["rent"] + " " + row_list[6]).strip()
-                            continue
-
-                        if is_change_table_page:
-                            is_change_table_page = False
-
-                        mapping = {
-                            "점유부분": row_list[1],
-                            "정보출처": row_list[2],
-                            "점유의권원": row_list[3],
-                            "임대차기간": row_list[4],
-                            "보증금": row_list[5],
-                            "차임": row_list[6],
-                            "전입신고": row_list[7],
-                            "확정일자": row_list[8],
-                            "배당요구": row_list[9],
-                        }
+                # 데이터 정제: None 제거 및 줄바꿈 처리 (블록 전체를 한 번에)
+                cells = table.cells[start_idx:end_idx]
+
+                # 빈 행 / 머리글 행 제외
+                row_text = ["".join(row) for row in cells.tolist()]
+                keep = [text != "" and not OCCUPANT_HEADER_PATTERN.search(text) for text in row_text]
+                cells = cells[np.array(keep, dtype=bool)]
+
+                if len(cells) == 0:
+                    return result
+
+                # 점유자 이름 설정 (이름 칸이 비어 있으면 위 행 이름 사용)
+                names = []
+                for value in cells[:, 0].tolist():
+                    if value:
+                        current_name = value
+                    names.append(current_name)
+
+                if plan["is_continuation"] and is_change_table_page:
+                    # 페이지가 바뀌면서 위의 내용과 연결되어있는지 체크하고 이전 내용에 추가하는 부분
+                    first_row = cells[0].tolist()
+                    if first_row[columns["정보출처"]] == "":
+                        if last_occupant:
+                            last_occupant["name"] = (last_occupant["name"] + " " + first_row[0]).strip()
+                            for field, key in OCCUPANT_FIELDS.items():
+                                if key:
+                                    last_occupant[key] = (last_occupant[key] + " " + first_row[columns[field]]).strip()
+                        cells = cells[1:]
+                        names = names[1:]
+
+                mapping = apply_occupant_plan(plan, cells)
+
+                for name, unit, info_source, occupancy_type, move_in_date, confirmed_date, dividend_claim_date, deposit, rent in zip(
+                        names, mapping["점유부분"].tolist(), mapping["정보출처"].tolist(), mapping["점유의권원"].tolist(),
+                        mapping["전입신고"].tolist(), mapping["확정일자"].tolist(), mapping["배당요구"].tolist(),
+                        mapping["보증금"].tolist(), mapping["차임"].tolist()):
 
                     # 최종 데이터 구조화
                     details = {
                         # "name": current_name,
-                        "unit": mapping["점유부분"],
-                        "info_source": mapping["정보출처"],
-                        "occupancy_type": mapping["점유의권원"],
+                        "unit": unit,
+                        "info_source": info_source,
+                        "occupancy_type": occupancy_type,
                         # "임대차기간": mapping["임대차기간"], # 현재 스키마에 없음
-                        "move_in_date": mapping["전입신고"],
-                        "confirmed_date": mapping["확정일자"],
-                        "dividend_claim_date": mapping["배당요구"],
-                        "deposit": mapping["보증금"],
-                        "rent": mapping["차임"],
+                        "move_in_date": move_in_date,
+                        "confirmed_date": confirmed_date,
+                        "dividend_claim_date": dividend_claim_date,
+                        "deposit": deposit,
+                        "rent": rent,
                     }
 
                     # 성명(current_name)이 이미 존재하면 리스트에 추가, 없으면 새로 생성
-                    if current_name not in result["occupants"]:
-                        result["occupants"][current_name] = []
+                    if name not in result["occupants"]:
+                        result["occupants"][name] = []
 
-                    result["occupants"][current_name].append(details)
-                    last_occupant = result["occupants"][current_name][-1]
+                    result["occupants"][name].append(details)
 
         return result
 
@@ -350,12 +612,62 @@ def get_occupants(table, current_name, last_occupant, is_change_table_page):
         return None
 
 
+# 권리 및 비고 섹션 (결과 키, 시작 표지, 시작 행에서 지울 문구) - 한 행에 여러 개가 있으면 앞 순서 우선
+GENERAL_NOTE_SECTIONS = [
+    # <비고>: 임차인 관련 비고 전체 문구
+    ("tenant_note", "<비고>", "<비고>"),
+    # 등기된 부동산에 관한 권리 또는 가처분으로 매각으로 그 효력이 소멸되지 아니하는 것
+    ("surviving_rights", "등기된 부동산에 관한 권리 또는 가처분으로 매각으로",
+     "등기된 부동산에 관한 권리 또는 가처분으로 매각으로 그 효력이 소멸되지 아니하는 것"),
+    # 매각에 따라 설정된 것으로 보는 지상권의 개요
+    ("surface_right_summary", "매각에 따라 설정된 것으로 보는 지상권의 개요", "매각에 따라 설정된 것으로 보는 지상권의 개요"),
+    # 비고란: 매각물건 명세서 마지막 문서 전체 비고 내용
+    ("general_note", "비고란", "비고란"),
+]
+
+# 수집 종료 표지 (행에 있으면 모든 섹션 수집 중단, 같은 행의 시작 표지는 그 다음에 처리)
+GENERAL_NOTE_STOP_KEYWORDS = ["※ 최선순위 설정일자보다 대항요건을", "등기된 부동산", "매각에 따라 설정된", "비고란",
+                              "※1: 매각목적물에서 제외되는"]
+
+
+# 여러 표지를 한 번에 찾는 검사기 컴파일 (반환: {"pattern": 정규식, "outputs": 찾은 문구 → 그 안에 들어 있는 표지들})
+# 긴 표지부터 시도하므로 다른 표지 안에 들어 있는 짧은 표지(예: 등기된 부동산)는 outputs 로 같이 찾음
+# 한 표지의 끝이 다른 표지의 시작과 겹칠 수 있으면 위치마다 검사(lookahead)해서 겹친 표지도 찾음
+def compile_marker_matcher(markers):
+    markers = sorted(set(markers), key=len, reverse=True)
+    alternation = "|".join(re.escape(marker) for marker in markers)
+
+    overlapping = any(
+        a[-size:] == b[:size]
+        for a in markers for b in markers if b not in a
+        for size in range(1, min(len(a), len(b)))
+    )
+    return {
+        "pattern": re.compile(f"(?=({alternation}))" if overlapping else alternation),
+        "outputs": {marker: frozenset(other for other in markers if other in marker) for marker in markers},
+    }
+
+
+# 문자열에 들어 있는 표지 찾기 (한 번 훑음, 반환: 표지 set)
+def find_markers(matcher, text):
+    found = set()
+    for hit in matcher["pattern"].findall(text):
+        found |= matcher["outputs"][hit]
+    return found
+
+
+# 권리 및 비고 표지 검사기 (섹션 시작 + 수집 종료)
+GENERAL_NOTE_MATCHER = compile_marker_matcher(
+    [marker for _, marker, _ in GENERAL_NOTE_SECTIONS] + GENERAL_NOTE_STOP_KEYWORDS)
+
+
 # 권리 및 비고 정보 가져오기
+# 섹션별 수집 상태(is_collecting_bigo 등)를 행마다 표지에 따라 바꾸면서 수집 중인 섹션에 행 텍스트 누적
 def get_general_notes(table, is_collecting_bigo, is_surviving_rights, is_surface_right_summary, is_general_note):
 
     try:
-        df = pd.DataFrame(table)
-        if df.empty:
+        table = to_parsed_table(table)
+        if table.empty:
             return None
 
         # 결과 데이터
@@ -366,74 +678,38 @@ def get_general_notes(table, is_collecting_bigo, is_surviving_rights, is_surface
             "general_note": "", # 매각물건 명세서 마지막 문서 전체 비고 내용
         }
 
-        # 권리 및 비고정보 넣기
-        for i in range(len(df)):
-            # 행 전체 텍스트 합치기
-            full_row_text = " ".join([line_change_spacing_val(v) for v in df.iloc[i].tolist()])
-            # print("===========")
-            # print('full_row_text', full_row_text)
-
-            # <비고> 수집 종료 조건 체크
-            stop_keywords = ["※ 최선순위 설정일자보다 대항요건을", "등기된 부동산", "매각에 따라 설정된", "비고란", "※1: 매각목적물에서 제외되는"]
-            if any(k in full_row_text for k in stop_keywords):
-                # print('해당 키워드 발견 ')
-                is_collecting_bigo = False
-                is_surviving_rights = False
-                is_surface_right_summary = False
-                is_general_note = False
-
-            # <비고>
-            if "<비고>" in full_row_text:
-                is_collecting_bigo = True
-                content = full_row_text.replace("<비고>", "").strip()
-                # print("content", content)
-                if content:
-                    result["tenant_note"] = (result["tenant_note"] + " " + content).strip()
-                continue
+        # 섹션별 수집 상태
+        collecting = {
+            "tenant_note": is_collecting_bigo,
+            "surviving_rights": is_surviving_rights,
+            "surface_right_summary": is_surface_right_summary,
+            "general_note": is_general_note,
+        }
 
-            # <비고> 내용 누적 (플래그가 True일 때만 실행)
-            if is_collecting_bigo:
-                if full_row_text:  # 빈 행이 아닐 때만
-                    result["tenant_note"] = (result["tenant_note"] + " " + full_row_text).strip()
-
-            # 등기된 부동산에 관한 권리 또는 가처분으로 매각으로 그 효력이 소멸되지 아니하는 것
-            if "등기된 부동산에 관한 권리 또는 가처분으로 매각으로" in full_row_text:
-                is_surviving_rights = True
-                content = full_row_text.replace("등기된 부동산에 관한 권리 또는 가처분으로 매각으로 그 효력이 소멸되지 아니하는 것", "").strip()
-                if content:
-                    result["surviving_rights"] = (result["surviving_rights"] + " " + content).strip()
+        # 권리 및 비고정보 넣기
+        for full_row_text in table.row_texts:
+            # 행 전체 텍스트 (ParsedTable 에서 1번만 합침)에서 표지를 한 번에 찾기
+            markers = find_markers(GENERAL_NOTE_MATCHER, full_row_text)
+            if not markers and not any(collecting.values()):
                 continue
 
-            # "등기된 부동산에 관한 권리 또는 가처분으로 매각으로 그 효력이 소멸되지 아니하는 것" 내용 누적 (플래그가 True일 때만 실행)
-            if is_surviving_rights:
-                if full_row_text:  # 빈 행이 아닐 때만
-                    result["surviving_rights"] = (result["surviving_rights"] + " " + full_row_text).strip()
-
-            # 매각에 따라 설정된 것으로 보는 지상권의 개요
-            if "매각에 따라 설정된 것으로 보는 지상권의 개요" in full_row_text:
-                is_surface_right_summary = True
-                content = full_row_text.replace("매각에 따라 설정된 것으로 보는 지상권의 개요", "").strip()
-                if content:
-                    result["surface_right_summary"] = (result["surface_right_summary"] + " " + content).strip()
-                continue
+            # 수집 종료 조건 체크
+            if not markers.isdisjoint(GENERAL_NOTE_STOP_KEYWORDS):
+                for key in collecting:
+                    collecting[key] = False
 
-            if is_surface_right_summary:
-                if full_row_text:  # 빈 행이 아닐 때만
-                    result["surface_right_summary"] = (
-                                result["surface_right_summary"] + " " + full_row_text).strip()
-
-            # 비고란
-            if "비고란" in full_row_text:
-                is_general_note = True
-                content = full_row_text.replace("비고란", "").strip()
-                if content:
-                    result["general_note"] = (result["general_note"] + " " + content).strip()
-                continue
+            for key, marker, label in GENERAL_NOTE_SECTIONS:
+                # 섹션 시작: 표지를 뺀 나머지를 누적하고 다음 행으로
+                if marker in markers:
+                    collecting[key] = True
+                    content = full_row_text.replace(label, "").strip()
+                    if content:
+                        result[key] = (result[key] + " " + content).strip()
+                    break
 
-            # 비고란 내용 누적 (플래그가 True일 때만 실행)
-            if is_general_note:
-                if full_row_text:  # 빈 행이 아닐 때만
-                    result["general_note"] = (result["general_note"] + " " + full_row_text).strip()
+                # 내용 누적 (수집 중일 때, 빈 행이 아닐 때만)
+                if collecting[key] and full_row_text:
+                    result[key] = (result[key] + " " + full_row_text).strip()
 
         return result
 
@@ -442,9 +718,7 @@ def get_general_notes(table, is_collecting_bigo, is_surviving_rights, is_surface
         return None
 
 
-
-
-# 회차별 기일 정보
+# 회차별 기일 정보 (page: PageLayout 또는 pdfplumber 페이지)
 def get_rounds_data(page):
 
     # 결과
@@ -485,8 +759,42 @@ def get_rounds_data(page):
     return results
 
 
+# 명세서 본문 종료 문구 (공백 제거 기준, 이 문구가 나온 페이지 이후는 별지)
+SPEC_END_KEYWORD = "※1:매각목적물에서제외되는"
+
+# 회차별 기일 표 패턴 (헤더 → 회차 행 → 구분선 순서로 나오면 표 종료)
+ROUND_LINE_PATTERN = re.compile(r"^\d+회\s+\d{4}\.\d{2}\.\d{2}")
+SEPARATOR_LINE_PATTERN = re.compile(r"^-{5,}$")
+
+
+# 섹션 수집 완료 여부 갱신 (모든 섹션이 수집되었으면 True)
+def update_completion(completion, page_text):
+    if not page_text:
+        return False
+
+    # 명세서 본문 종료 문구
+    if SPEC_END_KEYWORD in page_text.replace(" ", ""):
+        completion["spec_end"] = True
+
+    # 회차별 기일 표 상태: none → header → rows → closed
+    for line in page_text.split("\n"):
+        line = line.strip()
+        if completion["rounds"] == "none" and "회차" in line and "최저매각가격" in line.replace(" ", ""):
+            completion["rounds"] = "header"
+        elif completion["rounds"] in ("header", "rows") and ROUND_LINE_PATTERN.match(line):
+            completion["rounds"] = "rows"
+        elif completion["rounds"] == "rows" and SEPARATOR_LINE_PATTERN.match(line):
+            completion["rounds"] = "closed"
+
+    return completion["spec_end"] and completion["rounds"] == "closed"
+
+
 # PDF 파싱 로직
-def pdf_maegak_parsing(pdf_path):
+# early_stop: 명세서 본문이 끝난 뒤(별지)는 회차별 기일 정보만 확인하고, 회차별 기일 표까지 수집하면 나머지 페이지는 읽지 않음
+#             (False 면 모든 페이지를 테이블 추출까지 전부 파싱, 판단이 잘못되는 문서 확인용)
+# backend: PDF 읽기 백엔드 ("pdfplumber" / "fitz", 기본값은 PARSING_BACKEND 환경변수)
+# with_metrics: 단계별 wall/cpu 시간과 페이지 수를 결과의 _metrics 에 추가 (기본: PARSING_METRICS)
+def pdf_maegak_parsing(pdf_path, early_stop=True, backend=None, with_metrics=None):
 
     # 리턴 데이터
     result = {
@@ -529,18 +837,42 @@ def pdf_maegak_parsing(pdf_path):
     # 이전 배열 요소를 참조하기 위한 변수
     last_occupant = None
 
+    # 머리글로 찾은 점유자 표 열 계획 (칸 수 → 계획, 다음 페이지의 이어지는 표에 사용)
+    occupant_plans = {}
+
+    # 섹션 수집 완료 체크 (명세서 본문 종료, 회차별 기일 표 종료)
+    completion = {"spec_end": False, "rounds": "none"}
+
+    # 단계별 시간 측정 (사용하지 않으면 None)
+    if with_metrics is None:
+        with_metrics = METRICS_CONFIG['enabled']
+    metrics = new_metrics() if with_metrics else None
+
     try:
 
         # PDF 파싱 시작
-        with pdfplumber.open(pdf_path) as pdf:
+        # 페이지 문자/단어/선 정보(PageLayout)는 1번만 계산해서 테이블/회차 추출에 공유
+        with ExitStack() as stack:
+            with measure(metrics, "open"):
+                pages = stack.enter_context(open_pdf_pages(pdf_path, backend))
 
-            for p_idx, page in enumerate(pdf.pages):
+            for p_idx, page in enumerate(iter_measured_pages(pages, metrics)):
+
+                # 명세서 본문이 끝난 뒤(별지)는 회차별 기일 정보만 확인
+                if completion["spec_end"] and early_stop:
+                    with measure(metrics, "get_rounds_data"):
+                        rounds = get_rounds_data(page)
+                    if rounds:
+                        result["auction_rounds"].extend(rounds)
+
+                    if update_completion(completion, page.extract_text()):
+                        break
+                    continue
 
                 ##### PDF 테이블 가져오는 부분 시작 #####
 
                 # 하단 좌표 찾기 (마지막 행 인식 보정)
-                words = page.extract_words()
-                bottom_most = max(word['bottom'] for word in words) if words else page.bbox[3]
+                bottom_most = page.bottom_most
 
                 table_settings = {
                     "vertical_strategy": "lines",
@@ -551,33 +883,43 @@ def pdf_maegak_parsing(pdf_path):
                     "intersection_tolerance": 15,
                 }
 
-                # 테이블 추출
-                tables = page.extract_tables(table_settings=table_settings)
+                with measure(metrics, "tables") as elapsed:
+                    # 괘선 구조로 전략을 먼저 선택 (테이블이 나올 수 없는 페이지는 추출 생략)
+                    strategy, template_key = choose_table_strategy(page, table_settings)
+                    tables = []
+
+                    if strategy == STRATEGY_LINES:
+                        # 테이블 추출
+                        tables = page.extract_tables(table_settings=table_settings)
 
-                # 'lines'로 안 나올 경우 'text' 전략 시도
-                if not tables:
-                    table_settings["horizontal_strategy"] = "text"
-                    tables = page.extract_tables(table_settings=table_settings)
+                    # 'lines'로 안 나올 경우 'text' 전략 시도
+                    if strategy == STRATEGY_TEXT or (strategy == STRATEGY_LINES and not tables):
+                        table_settings["horizontal_strategy"] = "text"
+                        tables = page.extract_tables(table_settings=table_settings)
+                record_page_tables(metrics, p_idx + 1, elapsed, len(tables))
+
+                record_strategy_result(template_key, strategy, table_settings["horizontal_strategy"] if strategy != STRATEGY_NONE else STRATEGY_NONE)
 
                 ##### PDF 테이블 가져오는 부분 종료 #####
 
 
                 ##### 데이터 가져오기 및 결과 데이터 설정 #####
-                for table in tables:
+                for raw_table in tables:
 
                     # 테이블 페이징 체크 변경
                     is_change_table_page = True
 
-                    # 테이블을 데이터프레임으로 변환
-                    df = pd.DataFrame(table)
+                    # 테이블 정제 (DataFrame 변환 1번, 각 섹션 추출에서 같이 사용)
+                    table = ParsedTable(raw_table)
 
                     # 데이터가 없는 경우 스킵
-                    if df.empty:
+                    if table.empty:
                         continue
 
                     # 1. 기본사건정보(Header) 가져오기
                     if result["case_no"] == "":
-                        case_data = get_default_case_data(table)
+                        with measure(metrics, "get_default_case_data"):
+                            case_data = get_default_case_data(table)
                         if case_data and case_data["case_no"]:
                             result["case_no"] = case_data["case_no"]
                             result["item_no"] = case_data["item_no"]
@@ -586,7 +928,8 @@ def pdf_maegak_parsing(pdf_path):
                             result["document_date"] = case_data["document_date"]
 
                     # 2. 권리 및 비고정보 가져오기
-                    general_notes = get_general_notes(table, is_collecting_bigo, is_surviving_rights, is_surface_right_summary, is_general_note)
+                    with measure(metrics, "get_general_notes"):
+                        general_notes = get_general_notes(table, is_collecting_bigo, is_surviving_rights, is_surface_right_summary, is_general_note)
                     if general_notes:
                         if general_notes["tenant_note"] and result["tenant_note"] == "":
                             result["tenant_note"] = general_notes["tenant_note"]
@@ -598,21 +941,31 @@ def pdf_maegak_parsing(pdf_path):
                             result["general_note"] = general_notes["general_note"]
 
                     # 3. 점유자별 상세정보 가져오기
-                    occupants_data = get_occupants(table, current_name, last_occupant, is_change_table_page)
+                    with measure(metrics, "get_occupants"):
+                        occupants_data = get_occupants(table, current_name, last_occupant, is_change_table_page,
+                                                       occupant_plans)
                     # print('occupants_data', occupants_data, len(occupants_data))
                     if occupants_data and "occupants" in occupants_data:
                         result["occupants"].update(occupants_data["occupants"])
 
                 # 4. 회차별 기일 정보 가져오기
-                rounds = get_rounds_data(page)
+                with measure(metrics, "get_rounds_data"):
+                    rounds = get_rounds_data(page)
                 if rounds and len(rounds) > 0:
                     result["auction_rounds"].extend(rounds)
 
+                # 모든 섹션을 수집했으면 남은 페이지는 생략
+                if update_completion(completion, page.extract_text()) and early_stop:
+                    break
 
     except Exception as e:
         # print(f"❌ 알 수 없는 오류 발생: {e}")
         result["result_code"] = 999
         result["result_msg"] = str(e)
+        result["error_class"] = type(e).__name__
+
+    if metrics is not None:
+        result["_metrics"] = finish_metrics(metrics)
     return result
 
 
@@ -640,48 +993,12 @@ if __name__ == "__main__":
 
     print(f"🔍 집계 시작 경로: {full_main_path}\n" + "=" * 45)
 
-    # 폴더명만 필터링하여 리스트업
-    parsing_list_folders = [d for d in os.listdir(full_main_path)
-                            if os.path.isdir(os.path.join(full_main_path, d))]
-
-    for item in parsing_list_folders:
-        # print('item', item)
-
-        # 최종 탐색 경로 생성
-        upload_path = os.path.join(full_main_path, item, target_sub_path)
-
-        if os.path.exists(upload_path):
-            # ~_1 로 끝나는 PDF 파일 찾기
-            pdf_files = [f for f in os.listdir(upload_path) if f.lower().endswith('_1.pdf')]
-
-            count = len(pdf_files)
-            print(f"{item} 폴더: {count}개의 PDF 파일이 있습니다.")
-
-            # 해당 pdf_files를 pdf_maegak_parsing 돌리기
-            for pdf_file in pdf_files:
-                pdf_full_path = os.path.join(upload_path, pdf_file)
-                print(f"   📄 [{pdf_file}] 파싱 시작...")
-
-                parsed_data = pdf_maegak_parsing(pdf_full_path)
-                # print(parsed_data)
-
-                # DB에 저장 -> 여기부분 작성
-                if parsed_data["result_code"] == 200:
-                    # DB 저장 실행
-                    success, db_msg = save_to_db(parsed_data)
-
-                    if success:
-                        print(f"      ✅ DB 저장 완료 (Parent ID: {db_msg})")
-                    else:
-                        error_info = f"DB Insert Fail: {db_msg}"
-                        print(f"      ❌ {error_info}")
-                        write_error_log(parsing_folder_name, item, pdf_file, error_info)
-                else:
-                    print(f"      ⚠️ 파싱 에러 [{parsed_data['result_code']}]: {parsed_data['result_msg']}")
-                    write_error_log(parsing_folder_name, item, pdf_file, parsed_data['result_msg'])
-
-        else:
-            print(f"{item} : (경로 없음 - {target_sub_path})")
+    # 폴더별 PDF 파싱 및 DB 저장 (프로세스 풀, 워커 수는 PARSING_WORKERS 환경변수)
+    from batch_runner import run_batch, BATCH_CONFIG
+    from dead_letter import get_dead_letter_path
+    from error_logger import get_error_log_path
+    from parse_metrics import print_run_metrics
+    stats = run_batch(full_main_path, target_sub_path, parsing_folder_name)
 
     # 종료시간
     end_time = time.time()
@@ -697,6 +1014,42 @@ if __name__ == "__main__":
     print("=" * 45)
 
     # 결과 출력
+    print(f"📊 전체 {stats['total']}건 / 성공 {stats['success']}건 / 실패 {stats['fail']}건 / 건너뜀 {stats['skipped'] + stats['unchanged']}건")
+
+    # 테이블 추출 전략 통계 (예측 실패로 'text' 재추출한 페이지 수)
+    fallback_count = sum(v.get("fallback", 0) for v in stats["strategy"].values())
+    page_count = sum(v.get("lines", 0) + v.get("text", 0) + v.get("none", 0) for v in stats["strategy"].values())
+    print(f"📐 테이블 전략: {page_count}페이지 중 재추출 {fallback_count}페이지")
+
+    # DB 커넥션 풀 통계
+    db_pool = stats["db_pool"]
+    print(f"🔌 DB 커넥션 풀: 재사용 {db_pool.get('hits', 0)}회 / 새 연결 {db_pool.get('misses', 0)}회 / "
+          f"대기 {db_pool.get('waits', 0)}회 ({db_pool.get('wait_seconds', 0):.2f}초)")
+
+    # DB 재시도 / 데드레터 통계
+    if stats["db_retry"]:
+        print("🔁 DB 재시도: " + " / ".join(f"{k} {v}회" for k, v in stats["db_retry"].items()))
+    if stats["dead_letter"]:
+        print(f"📮 저장 실패 {stats['dead_letter']}건은 {get_dead_letter_path(parsing_folder_name)} 에 보관됨 "
+              f"(재적재: python dead_letter.py {get_dead_letter_path(parsing_folder_name)})")
+
+    # 중복 방지 모드 통계
+    if SAVE_CONFIG['upsert']:
+        db_upsert = stats["db_upsert"]
+        print(f"🔁 중복 방지 저장: 신규 {db_upsert['inserted']}건 / 변경 {db_upsert['updated']}건 / "
+              f"변경 없음 {db_upsert['unchanged']}건")
+
+    # DB 묶음 저장 통계
+    db_writer = stats["db_writer"]
+    if "batches" in db_writer:
+        print(f"📦 DB 묶음 저장: {db_writer['batches']}회 커밋 / {db_writer['documents']}건 저장 / "
+              f"묶음 실패 {db_writer['batch_failures']}회 / 저장 대기열 가득 참 {db_writer['queue_blocked']}회 "
+              f"({db_writer['queue_blocked_seconds']:.2f}초)")
+    else:
+        print(f"📝 스테이징 기록: {db_writer['documents']}건 (적재: python bulk_loader.py {BATCH_CONFIG['bulk_dir']})")
+    # 단계별 시간 / 느린 파일 (PARSING_METRICS=1 일 때)
+    print_run_metrics(stats["metrics"])
     print(f"⏱️ 총 소요 시간: {hours}시간 {minutes}분 {seconds}초")
 
-    print(f"✨ 전체 작업 완료. 에러 내역은 error/error_{parsing_folder_name}.txt 를 확인하세요.")
\ No newline at end of file
+    print(f"✨ 전체 작업 완료. 에러 내역은 {get_error_log_path(parsing_folder_name)} 를 확인하세요. "
+          f"(요약: python error_logger.py {parsing_folder_name})")
\ No newline at end of file
@@ -0,0 +1,55 @@
+from pdfplumber.table import TableFinder, TableSettings
+from pdfplumber.utils.text import WordExtractor, DEFAULT_X_TOLERANCE, DEFAULT_Y_TOLERANCE
+
+
+# 공유 단어 목록을 그대로 쓸 수 있는 extract_words 설정 (pdfplumber 기본값)
+DEFAULT_WORD_SETTINGS = {"x_tolerance": DEFAULT_X_TOLERANCE, "y_tolerance": DEFAULT_Y_TOLERANCE}
+
+
+class PageLayout:
+    """
+    pdfplumber 페이지의 문자/단어/선 정보를 한 번만 계산해서 공유하는 객체.
+    extract_words / extract_tables / extract_text 가 같은 단어 목록을 재사용합니다.
+    그 외 속성은 원본 페이지로 위임합니다.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.chars = page.chars
+        self.edges = page.edges
+
+        # 단어 추출 (문자 → 단어 변환은 여기서 1번만 수행)
+        self.wordmap = WordExtractor(**DEFAULT_WORD_SETTINGS).extract_wordmap(self.chars)
+        self.words = [word for word, _ in self.wordmap.tuples]
+
+        self._text = None
+
+    def __getattr__(self, name):
+        return getattr(self.page, name)
+
+    # 하단 좌표 (마지막 행 인식 보정용)
+    @property
+    def bottom_most(self):
+        return max(word['bottom'] for word in self.words) if self.words else self.page.bbox[3]
+
+    def extract_words(self, **kwargs):
+        # 기본 설정이면 공유 단어 목록 반환, 다른 설정이면 원본 페이지에서 새로 추출
+        if all(DEFAULT_WORD_SETTINGS.get(k) == v for k, v in kwargs.items()):
+            return self.words
+        return self.page.extract_words(**kwargs)
+
+    def extract_tables(self, table_settings=None):
+        # TableFinder에 이 객체를 넘겨서 'text' 전략도 공유 단어 목록을 사용하도록 함
+        tset = TableSettings.resolve(table_settings)
+        tables = TableFinder(self, tset).tables
+        return [table.extract(**(tset.text_settings or {})) for table in tables]
+
+    def extract_text(self):
+        # page.extract_text() 와 같은 결과를 공유 단어 목록에서 생성
+        if self._text is None:
+            self._text = self.wordmap.to_textmap(
+                layout_bbox=self.page.bbox,
+                layout_width=self.page.width,
+                layout_height=self.page.height,
+            ).as_string
+        return self._text
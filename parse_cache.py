@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from importlib import metadata
+
+from file_fingerprint import get_file_sha256
+from pdf_backends import DEFAULT_BACKEND
+
+
+# 파싱 결과 캐시 설정 (환경변수로 변경 가능)
+CACHE_CONFIG = {
+    'enabled': os.getenv('PARSING_CACHE', '1') == '1',
+    'path': os.getenv('PARSING_CACHE_PATH', os.path.join("cache", "parse_cache.db")),
+    # 캐시 최대 크기 (MB), 초과 시 가장 오래 사용하지 않은 항목부터 삭제
+    'max_mb': int(os.getenv('PARSING_CACHE_MAX_MB', 512)),
+}
+
+# 파서 버전 계산에 포함되는 소스 파일 (내용이 바뀌면 캐시 자동 무효화)
+PARSER_SOURCE_FILES = ["module_test_parsing.py", "page_layout.py", "table_strategy.py",
+                       "pdf_backends.py", "parse_metrics.py"]
+
+# 파서 버전 계산에 포함되는 패키지 (업그레이드하면 추출 결과가 달라질 수 있으므로 캐시 자동 무효화)
+PARSER_PACKAGES = ["pdfplumber", "pdfminer.six", "pandas", "numpy", "PyMuPDF"]
+
+# 프로세스별 캐시 연결 객체
+_cache_conn = None
+_parser_version = None
+
+
+# 파서 소스 파일 내용 + 패키지 버전 기준 버전 문자열
+def get_parser_version():
+    global _parser_version
+
+    if _parser_version is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        sha = hashlib.sha256()
+        for file_name in PARSER_SOURCE_FILES:
+            with open(os.path.join(base_dir, file_name), "rb") as f:
+                sha.update(f.read())
+        for package in PARSER_PACKAGES:
+            sha.update(f"{package}=={get_package_version(package)}\n".encode())
+        _parser_version = sha.hexdigest()[:16]
+
+    return _parser_version
+
+
+# 설치된 패키지 버전 (PyMuPDF 처럼 선택 설치 패키지가 없으면 빈 문자열)
+def get_package_version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def get_cache_connection():
+    """파싱 결과 캐시(SQLite) 연결 객체를 반환하는 공통 함수"""
+    global _cache_conn
+
+    if _cache_conn is None:
+        cache_dir = os.path.dirname(CACHE_CONFIG['path'])
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # 여러 워커 프로세스가 같은 파일을 쓰므로 WAL + 대기시간 설정
+        conn = sqlite3.connect(CACHE_CONFIG['path'], timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                cache_key TEXT PRIMARY KEY,
+                parser_version TEXT NOT NULL,
+                result_json TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_last_access ON parse_cache (last_access)")
+
+        # 파서 버전이 바뀐 항목은 삭제
+        conn.execute("DELETE FROM parse_cache WHERE parser_version != ?", (get_parser_version(),))
+        conn.commit()
+        _cache_conn = conn
+
+    return _cache_conn
+
+
+# 캐시 키 (PDF 내용 해시 + 파서 버전 + PDF 백엔드)
+def make_cache_key(sha256):
+    return f"{sha256}:{get_parser_version()}:{DEFAULT_BACKEND}"
+
+
+# 캐시 조회 (없으면 None)
+def get_cached_result(sha256, pdf_path):
+    conn = get_cache_connection()
+    cache_key = make_cache_key(sha256)
+
+    row = conn.execute("SELECT result_json FROM parse_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+    if row is None:
+        return None
+
+    # LRU 갱신
+    conn.execute("UPDATE parse_cache SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+    conn.commit()
+
+    result = json.loads(row[0])
+    # 같은 내용의 다른 경로 파일일 수 있으므로 경로는 현재 값으로 교체
+    result["pdf_path"] = pdf_path
+    return result
+
+
+# 캐시 저장 (정상 처리된 결과만)
+def put_cached_result(sha256, result):
+    if result.get("result_code") != 200:
+        return
+
+    conn = get_cache_connection()
+    # 실행 시간 측정값(_metrics)은 캐시하지 않음 (캐시 적중 시 측정값 없음)
+    result_json = json.dumps({k: v for k, v in result.items() if k != "_metrics"}, ensure_ascii=False)
+    size_bytes = len(result_json.encode("utf-8"))
+
+    conn.execute("""
+        INSERT OR REPLACE INTO parse_cache (cache_key, parser_version, result_json, size_bytes, last_access)
+        VALUES (?, ?, ?, ?, ?)
+    """, (make_cache_key(sha256), get_parser_version(), result_json, size_bytes, time.time()))
+
+    evict_cache(conn)
+    conn.commit()
+
+
+# 최대 크기 초과 시 가장 오래 사용하지 않은 항목부터 삭제
+def evict_cache(conn):
+    max_bytes = CACHE_CONFIG['max_mb'] * 1024 * 1024
+    total_bytes = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM parse_cache").fetchone()[0]
+    if total_bytes <= max_bytes:
+        return
+
+    rows = conn.execute("SELECT cache_key, size_bytes FROM parse_cache ORDER BY last_access")
+    evict_keys = []
+    for cache_key, size_bytes in rows:
+        if total_bytes <= max_bytes:
+            break
+        evict_keys.append((cache_key,))
+        total_bytes -= size_bytes
+
+    conn.executemany("DELETE FROM parse_cache WHERE cache_key = ?", evict_keys)
+
+
+# 캐시를 거치는 PDF 파싱 (sha256이 없으면 계산)
+def cached_parsing(parse_func, pdf_path, sha256=None):
+    if not CACHE_CONFIG['enabled'] or not os.path.exists(pdf_path):
+        return parse_func(pdf_path)
+
+    if sha256 is None:
+        sha256 = get_file_sha256(pdf_path)
+
+    cached = get_cached_result(sha256, pdf_path)
+    if cached is not None:
+        return cached
+
+    result = parse_func(pdf_path)
+    put_cached_result(sha256, result)
+    return result
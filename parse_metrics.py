@@ -0,0 +1,110 @@
+import os
+import time
+import heapq
+from contextlib import contextmanager
+
+
+# 단계별 시간 측정 설정 (환경변수로 변경 가능)
+METRICS_CONFIG = {
+    # pdf_maegak_parsing 결과에 _metrics 추가 여부
+    'enabled': os.getenv('PARSING_METRICS', '0') == '1',
+    # 실행 요약에 보여줄 느린 파일 수
+    'top_n': int(os.getenv('PARSING_METRICS_TOP_N', 10)),
+}
+
+
+# 문서 1건의 측정값 (stages: 단계별 wall/cpu 초와 호출 수, pages: 페이지별 테이블 추출 시간)
+def new_metrics():
+    return {"wall": 0.0, "cpu": 0.0, "page_count": 0, "stages": {}, "pages": [],
+            "_start": (time.perf_counter(), time.process_time())}
+
+
+# 블록 실행 시간을 metrics["stages"][stage] 에 누적 (metrics 가 None 이면 측정하지 않음)
+@contextmanager
+def measure(metrics, stage):
+    if metrics is None:
+        yield None
+        return
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    elapsed = {}
+    try:
+        yield elapsed
+    finally:
+        elapsed["wall"] = time.perf_counter() - wall_start
+        elapsed["cpu"] = time.process_time() - cpu_start
+
+        stat = metrics["stages"].setdefault(stage, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        stat["wall"] += elapsed["wall"]
+        stat["cpu"] += elapsed["cpu"]
+        stat["calls"] += 1
+
+
+# 페이지 읽기(글자/선 추출) 시간을 page_load 단계로 측정하면서 페이지 반환
+def iter_measured_pages(pages, metrics):
+    if metrics is None:
+        yield from pages
+        return
+
+    page_iter = iter(pages)
+    while True:
+        with measure(metrics, "page_load"):
+            page = next(page_iter, None)
+        if page is None:
+            return
+        metrics["page_count"] += 1
+        yield page
+
+
+# 페이지별 테이블 추출 시간 기록
+def record_page_tables(metrics, page_number, elapsed, table_count):
+    if metrics is not None:
+        metrics["pages"].append({"page": page_number, "wall": elapsed["wall"], "cpu": elapsed["cpu"],
+                                 "tables": table_count})
+
+
+# 전체 시간 기록 후 결과에 붙일 형태로 정리
+def finish_metrics(metrics):
+    wall_start, cpu_start = metrics.pop("_start")
+    metrics["wall"] = time.perf_counter() - wall_start
+    metrics["cpu"] = time.process_time() - cpu_start
+    return metrics
+
+
+# 실행 전체 집계 (단계별 합계 + 느린 파일 top N)
+def new_run_metrics():
+    return {"files": 0, "pages": 0, "wall": 0.0, "stages": {}, "slowest": []}
+
+
+def merge_run_metrics(run_metrics, pdf_file, metrics, top_n=None):
+    top_n = top_n or METRICS_CONFIG['top_n']
+
+    run_metrics["files"] += 1
+    run_metrics["pages"] += metrics["page_count"]
+    run_metrics["wall"] += metrics["wall"]
+    for stage, stat in metrics["stages"].items():
+        total = run_metrics["stages"].setdefault(stage, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        for k in total:
+            total[k] += stat[k]
+
+    # 가장 느린 단계와 함께 보관 (최소 힙으로 top N 유지)
+    slowest_stage = max(metrics["stages"].items(), key=lambda x: x[1]["wall"], default=(None, None))[0]
+    entry = (metrics["wall"], pdf_file, metrics["page_count"], slowest_stage)
+    if len(run_metrics["slowest"]) < top_n:
+        heapq.heappush(run_metrics["slowest"], entry)
+    elif entry > run_metrics["slowest"][0]:
+        heapq.heapreplace(run_metrics["slowest"], entry)
+
+
+def print_run_metrics(run_metrics):
+    if not run_metrics["files"]:
+        return
+
+    print(f"⏱️ 단계별 시간 ({run_metrics['files']}건 / {run_metrics['pages']}페이지 / 파싱 {run_metrics['wall']:.1f}초)")
+    for stage, stat in sorted(run_metrics["stages"].items(), key=lambda x: -x[1]["wall"]):
+        print(f"   - {stage:<24} wall {stat['wall']:.2f}s / cpu {stat['cpu']:.2f}s / {stat['calls']}회")
+
+    print(f"🐢 느린 파일 top {len(run_metrics['slowest'])}")
+    for wall, pdf_file, page_count, slowest_stage in sorted(run_metrics["slowest"], reverse=True):
+        print(f"   - {pdf_file}: {wall:.2f}s / {page_count}페이지 (가장 느린 단계: {slowest_stage})")
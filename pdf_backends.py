@@ -0,0 +1,164 @@
+import os
+from contextlib import contextmanager
+
+import pdfplumber
+from pdfplumber.utils.text import extract_words
+
+from page_layout import PageLayout
+
+
+# PDF 읽기 백엔드 (환경변수로 변경 가능)
+BACKEND_PDFPLUMBER = "pdfplumber"  # pdfminer 기반 (기존 방식)
+BACKEND_FITZ = "fitz"  # PyMuPDF 기반 (빠름, 신뢰도 낮은 페이지만 pdfplumber로 다시 읽음)
+
+DEFAULT_BACKEND = os.getenv('PARSING_BACKEND', BACKEND_PDFPLUMBER)
+
+# 좌표가 같은 것으로 보는 허용 오차 (가로/세로선 판별)
+AXIS_TOLERANCE = 0.1
+
+# 인식하지 못한 글자 (폰트 매핑 실패)
+UNKNOWN_CHAR = "�"
+
+
+class FitzPage:
+    """
+    PyMuPDF 페이지를 pdfplumber 페이지처럼 쓰기 위한 객체.
+    PageLayout / TableFinder 가 사용하는 chars, edges, bbox, extract_words 만 제공합니다.
+    """
+
+    def __init__(self, fitz_page, doctop_offset=0):
+        self.page_number = fitz_page.number + 1
+        self.width = fitz_page.rect.width
+        self.height = fitz_page.rect.height
+        self.bbox = (0, 0, self.width, self.height)
+        self.chars = fitz_chars(fitz_page, doctop_offset)
+        self.edges = fitz_edges(fitz_page)
+
+    # 페이지 신뢰도 (인식하지 못한 글자가 있으면 낮음)
+    @property
+    def is_low_confidence(self):
+        return any(c["text"] == UNKNOWN_CHAR for c in self.chars)
+
+    def extract_words(self, **kwargs):
+        return extract_words(self.chars, **kwargs)
+
+
+# PyMuPDF 글자 → pdfplumber 글자 형식
+def fitz_chars(fitz_page, doctop_offset):
+    chars = []
+    page_height = fitz_page.rect.height
+
+    for block in fitz_page.get_text("rawdict")["blocks"]:
+        if block["type"] != 0:
+            continue
+
+        for line in block["lines"]:
+            upright = abs(line["dir"][1]) < AXIS_TOLERANCE and line["dir"][0] > 0
+
+            for span in line["spans"]:
+                for c in span["chars"]:
+                    x0, top, x1, bottom = c["bbox"]
+                    chars.append({
+                        "object_type": "char",
+                        "page_number": fitz_page.number + 1,
+                        "text": c["c"],
+                        "fontname": span["font"],
+                        "size": span["size"],
+                        "upright": upright,
+                        "x0": x0,
+                        "x1": x1,
+                        "y0": page_height - bottom,
+                        "y1": page_height - top,
+                        "top": top,
+                        "bottom": bottom,
+                        "doctop": top + doctop_offset,
+                        "width": x1 - x0,
+                        "height": bottom - top,
+                    })
+
+    return chars
+
+
+# 가로선 1개 (pdfplumber edge 형식)
+def h_edge(x0, x1, y, object_type):
+    x0, x1 = min(x0, x1), max(x0, x1)
+    return {"object_type": object_type, "orientation": "h",
+            "x0": x0, "x1": x1, "top": y, "bottom": y, "width": x1 - x0, "height": 0}
+
+
+# 세로선 1개 (pdfplumber edge 형식)
+def v_edge(x, top, bottom, object_type):
+    top, bottom = min(top, bottom), max(top, bottom)
+    return {"object_type": object_type, "orientation": "v",
+            "x0": x, "x1": x, "top": top, "bottom": bottom, "width": 0, "height": bottom - top}
+
+
+# PyMuPDF 도형 → pdfplumber edge 목록 (선, 사각형 테두리)
+def fitz_edges(fitz_page):
+    edges = []
+
+    for path in fitz_page.get_drawings():
+        for item in path["items"]:
+            kind = item[0]
+
+            if kind == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) < AXIS_TOLERANCE:
+                    edges.append(h_edge(p1.x, p2.x, p1.y, "line"))
+                elif abs(p1.x - p2.x) < AXIS_TOLERANCE:
+                    edges.append(v_edge(p1.x, p1.y, p2.y, "line"))
+
+            elif kind in ("re", "qu"):
+                rect = item[1] if kind == "re" else item[1].rect
+                edges.append(h_edge(rect.x0, rect.x1, rect.y0, "rect_edge"))
+                edges.append(h_edge(rect.x0, rect.x1, rect.y1, "rect_edge"))
+                edges.append(v_edge(rect.x0, rect.y0, rect.y1, "rect_edge"))
+                edges.append(v_edge(rect.x1, rect.y0, rect.y1, "rect_edge"))
+
+    return edges
+
+
+# pdfplumber 백엔드: 페이지별 PageLayout
+@contextmanager
+def open_pdfplumber_pages(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        yield (PageLayout(pdf_page) for pdf_page in pdf.pages)
+
+
+# fitz 백엔드: 페이지별 PageLayout (신뢰도 낮은 페이지는 pdfplumber로 다시 읽음)
+@contextmanager
+def open_fitz_pages(pdf_path):
+    import pymupdf
+
+    doc = pymupdf.open(pdf_path)
+    fallback = {}
+
+    def iter_pages():
+        doctop_offset = 0
+        for fitz_page in doc:
+            page = FitzPage(fitz_page, doctop_offset)
+            doctop_offset += page.height
+
+            if page.is_low_confidence:
+                if "pdf" not in fallback:
+                    fallback["pdf"] = pdfplumber.open(pdf_path)
+                yield PageLayout(fallback["pdf"].pages[fitz_page.number])
+            else:
+                yield PageLayout(page)
+
+    try:
+        yield iter_pages()
+    finally:
+        doc.close()
+        if "pdf" in fallback:
+            fallback["pdf"].close()
+
+
+# 백엔드 선택해서 PDF 열기 (with 문으로 사용, 페이지 PageLayout 을 순서대로 반환)
+def open_pdf_pages(pdf_path, backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend == BACKEND_FITZ:
+        return open_fitz_pages(pdf_path)
+    if backend == BACKEND_PDFPLUMBER:
+        return open_pdfplumber_pages(pdf_path)
+    raise ValueError(f"지원하지 않는 PDF 백엔드: {backend}")
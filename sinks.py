@@ -0,0 +1,41 @@
+import os
+
+from db_batch_writer import BackgroundWriter
+from bulk_loader import open_staging_writer
+from sqlite_sink import SqliteBatchWriter
+from checkpoint_journal import JOURNAL_PATH
+
+
+# 파싱 결과 저장소 (환경변수로 변경 가능)
+SINK_MYSQL = "mysql"  # MySQL 직접 저장 (기존 방식)
+SINK_SQLITE = "sqlite"  # 로컬 SQLite 파일 (DB 없이 실행, 나중에 sqlite_sink.py 로 MySQL 병합)
+SINK_BULK = "bulk"  # TSV 스테이징 파일 (나중에 bulk_loader.py 로 LOAD DATA)
+
+DEFAULT_SINK = os.getenv('PARSING_SINK', SINK_MYSQL)
+
+
+# 저장소 열기
+# 반환 객체는 submit(data, context) / drain_results() / close() / stats / RESULT_MESSAGE 를 제공
+# drain_results(), close() 는 저장이 끝난 문서의 [(context, 성공 여부, parent_idx 또는 에러 메시지)] 반환
+def open_sink(sink=None, bulk_dir=None):
+    sink = sink or DEFAULT_SINK
+    if sink == SINK_MYSQL:
+        return BackgroundWriter()
+    if sink == SINK_SQLITE:
+        # SQLite 는 쓰기 연결 1개만 사용
+        return BackgroundWriter(threads=1, writer_class=SqliteBatchWriter)
+    if sink == SINK_BULK:
+        if not bulk_dir:
+            raise ValueError("대량 적재 모드는 스테이징 폴더(PARSING_BULK_DIR)가 필요합니다")
+        return open_staging_writer(bulk_dir)
+    raise ValueError(f"지원하지 않는 저장소: {sink}")
+
+
+# 저장소별 체크포인트 저널 경로 (MySQL 은 기존 경로 그대로)
+# 저장소마다 parent_idx 의미가 달라서(SQLite 로컬 idx, 스테이징 키) 저널을 나누어 다른 저장소 실행에서 건너뛰지 않게 함
+def get_sink_journal_path(sink=None):
+    sink = sink or DEFAULT_SINK
+    if sink == SINK_MYSQL:
+        return JOURNAL_PATH
+    base, ext = os.path.splitext(JOURNAL_PATH)
+    return f"{base}_{sink}{ext}"
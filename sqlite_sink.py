@@ -0,0 +1,257 @@
+import os
+import sys
+import time
+import sqlite3
+
+from db_manager import pooled_connection, rollback_quietly
+from db_retry import run_with_retry, commit_checked
+from db_batch_writer import BatchWriter, build_multi_row_sql
+from module_test_parsing import (
+    build_master_row, build_round_rows, build_occupant_rows, find_saved_master, upsert_rows,
+    MASTER_INSERT_SQL, ROUNDS_INSERT_SQL, OCCUPANTS_INSERT_SQL, SAVE_CONFIG, UPSERT_STATS,
+)
+
+
+# SQLite 저장소 설정 (환경변수로 변경 가능)
+SQLITE_SINK_CONFIG = {
+    # 저장 파일 경로 (노드별로 다른 파일을 쓰고 나중에 MySQL로 병합)
+    'path': os.getenv('PARSING_SQLITE_PATH', os.path.join("sink", "maegak.db")),
+    # 병합 시 MySQL 트랜잭션 1번에 보내는 매각 행 수
+    'merge_chunk_size': int(os.getenv('SQLITE_MERGE_CHUNK_SIZE', 500)),
+}
+
+# MySQL 과 같은 3개 테이블 (mysql_idx: 병합 후 MySQL 에서 발급된 parent_idx, 재실행 시 이어서 병합)
+SQLITE_SCHEMA_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS tmp_maegak (
+        idx INTEGER PRIMARY KEY AUTOINCREMENT,
+        case_no TEXT, item_no INTEGER, priority_date TEXT, dividend_end_date TEXT, document_date TEXT,
+        tenant_note TEXT, surviving_rights TEXT, surface_right_summary TEXT, general_note TEXT,
+        pdf_file_path TEXT,
+        mysql_idx INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tmp_maegak_rounds (
+        idx INTEGER PRIMARY KEY AUTOINCREMENT,
+        parent_idx INTEGER NOT NULL, round_no INTEGER, auction_date TEXT, min_bid_price INTEGER, bid_deposit INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tmp_maegak_occupants (
+        idx INTEGER PRIMARY KEY AUTOINCREMENT,
+        parent_idx INTEGER NOT NULL, name TEXT, unit TEXT, info_source TEXT, occupancy_type TEXT,
+        move_in_date TEXT, confirmed_date TEXT, dividend_claim_date TEXT, deposit TEXT, rent TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_rounds_parent ON tmp_maegak_rounds (parent_idx)",
+    "CREATE INDEX IF NOT EXISTS ix_occupants_parent ON tmp_maegak_occupants (parent_idx)",
+]
+
+# 자식 테이블 컬럼 (parent_idx 제외, INSERT 문과 같은 순서)
+ROUND_COLUMNS = "round_no, auction_date, min_bid_price, bid_deposit"
+OCCUPANT_COLUMNS = ("name, unit, info_source, occupancy_type, move_in_date, confirmed_date, "
+                    "dividend_claim_date, deposit, rent")
+MASTER_COLUMNS = ("case_no, item_no, priority_date, dividend_end_date, document_date, tenant_note, "
+                  "surviving_rights, surface_right_summary, general_note, pdf_file_path")
+
+
+# MySQL용 SQL(%s)을 SQLite용(?)으로 변환
+def to_sqlite_sql(sql):
+    return sql.replace("%s", "?")
+
+
+# SQLite 저장 파일 열기 (WAL: 쓰는 동안에도 병합/조회 가능)
+def open_sqlite_sink(path=None):
+    path = path or SQLITE_SINK_CONFIG['path']
+    sink_dir = os.path.dirname(path)
+    if sink_dir and not os.path.exists(sink_dir):
+        os.makedirs(sink_dir)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for sql in SQLITE_SCHEMA_SQL:
+        conn.execute(sql)
+    conn.commit()
+    return conn
+
+
+class SqliteBatchWriter(BatchWriter):
+    """
+    MySQL 대신 SQLite 파일에 저장하는 BatchWriter (묶음 단위 트랜잭션).
+    연결은 처음 저장하는 스레드에서 열기 때문에 BackgroundWriter 의 저장 스레드에서 사용합니다.
+    SQLite 파일에는 항상 추가만 하고, 중복 방지 모드(DB_UPSERT)는 MySQL 로 병합할 때 적용합니다.
+    """
+
+    RESULT_MESSAGE = "✅ SQLite 저장 완료 (Parent ID: {})"
+
+    def __init__(self, on_result, batch_size=None, flush_ms=None):
+        super().__init__(on_result, batch_size, flush_ms)
+        self._conn = None
+
+    def close(self):
+        super().close()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write_one(self, data, verify=False):
+        success, result = self._write_batch([data])
+        return success, result[0] if success else result
+
+    def _write_batch(self, docs):
+        try:
+            if self._conn is None:
+                self._conn = open_sqlite_sink()
+        except Exception as e:
+            return False, f"SQLite Open Error: {e}"
+
+        cursor = self._conn.cursor()
+        try:
+            parent_ids = []
+            round_rows = []
+            occupant_rows = []
+            for data in docs:
+                cursor.execute(to_sqlite_sql(MASTER_INSERT_SQL), build_master_row(data))
+                parent_idx = cursor.lastrowid
+                parent_ids.append(parent_idx)
+                round_rows.extend(build_round_rows(parent_idx, data['auction_rounds']))
+                occupant_rows.extend(build_occupant_rows(parent_idx, data['occupants']))
+
+            cursor.executemany(to_sqlite_sql(ROUNDS_INSERT_SQL), round_rows)
+            cursor.executemany(to_sqlite_sql(OCCUPANTS_INSERT_SQL), occupant_rows)
+
+            self._conn.commit()
+            return True, parent_ids
+        except Exception as e:
+            self._conn.rollback()
+            return False, str(e)
+
+
+# SQLite 파일의 미병합 문서를 MySQL 로 옮기기 (chunk_size 건씩 트랜잭션, 반환: 병합 건수)
+# MySQL 커밋 후 mysql_idx 를 기록하므로 중단 후 다시 실행하면 이어서 병합
+# MySQL 커밋과 mysql_idx 기록 사이에 중단됐을 수 있으므로 첫 묶음은 이미 저장된 행을 확인한 뒤 저장
+def merge_sqlite_to_mysql(shard_path, chunk_size=None):
+    chunk_size = chunk_size or SQLITE_SINK_CONFIG['merge_chunk_size']
+    if not os.path.exists(shard_path):
+        raise FileNotFoundError(f"SQLite 파일 없음: {shard_path}")
+    shard = open_sqlite_sink(shard_path)
+    merged = 0
+    verify = True
+
+    try:
+        while True:
+            master_rows = shard.execute(
+                f"SELECT idx, {MASTER_COLUMNS} FROM tmp_maegak WHERE mysql_idx IS NULL ORDER BY idx LIMIT ?",
+                (chunk_size,)).fetchall()
+            if not master_rows:
+                break
+
+            local_ids = [row[0] for row in master_rows]
+            placeholders = ", ".join("?" * len(local_ids))
+            round_rows = shard.execute(
+                f"SELECT parent_idx, {ROUND_COLUMNS} FROM tmp_maegak_rounds "
+                f"WHERE parent_idx IN ({placeholders}) ORDER BY idx", local_ids).fetchall()
+            occupant_rows = shard.execute(
+                f"SELECT parent_idx, {OCCUPANT_COLUMNS} FROM tmp_maegak_occupants "
+                f"WHERE parent_idx IN ({placeholders}) ORDER BY idx", local_ids).fetchall()
+
+            id_map = run_with_retry(write_merge_chunk, master_rows, round_rows, occupant_rows, verify=verify)
+            verify = False
+
+            shard.executemany("UPDATE tmp_maegak SET mysql_idx = ? WHERE idx = ?",
+                              [(id_map[local_idx], local_idx) for local_idx in local_ids])
+            shard.commit()
+
+            merged += len(master_rows)
+            print(f"   📤 {merged}건 병합")
+    finally:
+        shard.close()
+
+    return merged
+
+
+# 병합 묶음 1개를 MySQL 트랜잭션 1번으로 저장 (반환: SQLite idx → MySQL parent_idx)
+# verify: 이전 시도의 커밋 여부를 모르는 재시도 (이미 저장된 매각 행은 그 parent_idx 사용, 나머지만 추가)
+def write_merge_chunk(master_rows, round_rows, occupant_rows, verify=False):
+    with pooled_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB Connection Error")
+
+        cursor = conn.cursor()
+        try:
+            # 중복 방지 모드: 문서별로 조회 후 갱신/생략 (다시 실행해도 중복되지 않으므로 verify 불필요)
+            if SAVE_CONFIG['upsert']:
+                results = upsert_merge_rows(cursor, master_rows, round_rows, occupant_rows)
+                commit_checked(conn)
+                for _, action in results.values():
+                    UPSERT_STATS[action] += 1
+                return {local_idx: parent_idx for local_idx, (parent_idx, _) in results.items()}
+
+            id_map = {}
+            if verify:
+                for row in master_rows:
+                    parent_idx = find_saved_master(cursor, tuple(row[1:]))
+                    if parent_idx is not None:
+                        id_map[row[0]] = parent_idx
+
+            pending_rows = [row for row in master_rows if row[0] not in id_map]
+            if pending_rows:
+                # 매각 테이블: 여러 행을 INSERT 1번으로 (AUTO_INCREMENT 값이 연속으로 발급됨)
+                cursor.execute(build_multi_row_sql(MASTER_INSERT_SQL, len(pending_rows)),
+                               [v for row in pending_rows for v in row[1:]])
+                first_idx = cursor.lastrowid
+                cursor.execute("SELECT @@SESSION.auto_increment_increment")
+                increment = cursor.fetchone()[0] or 1
+                new_ids = {row[0]: first_idx + i * increment for i, row in enumerate(pending_rows)}
+
+                if round_rows:
+                    cursor.executemany(ROUNDS_INSERT_SQL, [(new_ids[row[0]],) + tuple(row[1:])
+                                                           for row in round_rows if row[0] in new_ids])
+                if occupant_rows:
+                    cursor.executemany(OCCUPANTS_INSERT_SQL, [(new_ids[row[0]],) + tuple(row[1:])
+                                                              for row in occupant_rows if row[0] in new_ids])
+                id_map.update(new_ids)
+
+            commit_checked(conn)
+            return id_map
+        except Exception:
+            rollback_quietly(conn)
+            raise
+
+
+# 병합 묶음을 문서별 중복 방지 모드로 저장 (반환: SQLite idx → (MySQL parent_idx, 처리 구분))
+def upsert_merge_rows(cursor, master_rows, round_rows, occupant_rows):
+    rounds_by_parent = {}
+    for row in round_rows:
+        rounds_by_parent.setdefault(row[0], []).append(tuple(row))
+    occupants_by_parent = {}
+    for row in occupant_rows:
+        occupants_by_parent.setdefault(row[0], []).append(tuple(row))
+
+    return {
+        row[0]: upsert_rows(cursor, tuple(row[1:]), rounds_by_parent.get(row[0], []),
+                            occupants_by_parent.get(row[0], []))
+        for row in master_rows
+    }
+
+
+# 실행: python sqlite_sink.py <SQLite 파일> [<SQLite 파일> ...]
+if __name__ == "__main__":
+
+    if len(sys.argv) < 2:
+        print("사용법: python sqlite_sink.py <SQLite 파일> [<SQLite 파일> ...]")
+        sys.exit(1)
+
+    start_time = time.time()
+    for shard_path in sys.argv[1:]:
+        print(f"🔀 병합 시작: {shard_path}")
+        try:
+            count = merge_sqlite_to_mysql(shard_path)
+        except Exception as e:
+            print(f"❌ 병합 실패: {shard_path} ({e})")
+            sys.exit(1)
+        print(f"   ✅ {shard_path}: {count}건 병합 완료")
+
+    print(f"✨ 전체 병합 완료 ({time.time() - start_time:.1f}초)")
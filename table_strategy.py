@@ -0,0 +1,77 @@
+# 테이블 추출 전략 사전 선택 및 템플릿별 통계
+
+# 전략 값
+STRATEGY_LINES = "lines"  # 괘선 기준 추출
+STRATEGY_TEXT = "text"  # 가로는 텍스트 위치 기준 추출
+STRATEGY_NONE = "none"  # 테이블이 나올 수 없는 페이지 (추출 생략)
+
+# 프로세스별 템플릿 통계 {template_key: {"lines": n, "text": n, "fallback": n, "none": n}}
+STRATEGY_STATS = {}
+
+
+# 좌표 목록을 허용 오차 안에서 묶은 개수 (snap 후 서로 다른 선 위치 수)
+def count_positions(values, tolerance):
+    count = 0
+    last = None
+    for v in sorted(values):
+        if last is None or v - last > tolerance:
+            count += 1
+        last = v
+    return count
+
+
+# 페이지 괘선 구조로 전략 예측
+# 반환: (전략, 템플릿 키)
+def choose_table_strategy(page, table_settings):
+    snap_tolerance = table_settings.get("snap_tolerance", 3)
+    intersection_tolerance = table_settings.get("intersection_tolerance", 3)
+
+    v_edges = [e for e in page.edges if e["orientation"] == "v"]
+    h_edges = [e for e in page.edges if e["orientation"] == "h"]
+
+    # 세로선이 없으면 'lines', 'text' 어느 쪽도 셀이 만들어지지 않음 (별지 첨부 페이지 등)
+    if not v_edges:
+        return STRATEGY_NONE, "v0"
+
+    h_ys = [e["top"] for e in h_edges]
+
+    # 세로선과 만나는 경우에만 하단 보정선도 가로선으로 계산
+    for y in table_settings.get("explicit_horizontal_lines", []):
+        if any(e["top"] - intersection_tolerance <= y <= e["bottom"] + intersection_tolerance for e in v_edges):
+            h_ys.append(y)
+
+    v_count = count_positions([e["x0"] for e in v_edges], snap_tolerance)
+    h_count = count_positions(h_ys, snap_tolerance)
+
+    # 템플릿 키: 서로 다른 세로선/가로선 위치 수
+    template_key = f"v{v_count}_h{h_count}"
+
+    # 괘선으로 셀이 2개 이상 만들어질 수 없으면 (테이블 미인식) 처음부터 'text' 전략 사용
+    if (v_count - 1) * (h_count - 1) < 2:
+        return STRATEGY_TEXT, template_key
+
+    return STRATEGY_LINES, template_key
+
+
+# 전략 결과 기록 (used: 실제로 테이블을 얻은 전략, 예측이 빗나가 재추출한 경우 fallback)
+def record_strategy_result(template_key, predicted, used):
+    stats = STRATEGY_STATS.setdefault(template_key, {STRATEGY_LINES: 0, STRATEGY_TEXT: 0, "fallback": 0, STRATEGY_NONE: 0})
+    stats[used] += 1
+    if predicted != used and predicted != STRATEGY_NONE:
+        stats["fallback"] += 1
+
+
+# 통계 반환 후 초기화 (워커 → 부모 프로세스 전달용)
+def pop_strategy_stats():
+    stats = {k: dict(v) for k, v in STRATEGY_STATS.items()}
+    STRATEGY_STATS.clear()
+    return stats
+
+
+# 여러 워커의 통계 합치기
+def merge_strategy_stats(total, stats):
+    for template_key, counts in stats.items():
+        target = total.setdefault(template_key, {})
+        for k, v in counts.items():
+            target[k] = target.get(k, 0) + v
+    return total
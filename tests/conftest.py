@@ -0,0 +1,22 @@
+import os
+import sys
+
+# 저장소 최상위 모듈(db_manager, module_test_parsing 등)을 import 할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import pytest
+
+import db_manager
+import db_retry
+from fake_mysql import FakeServer
+
+
+# 가짜 MySQL 서버로 연결하는 풀 (재시도 대기 없음)
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(db_manager, "get_db_connection", server.connect)
+    monkeypatch.setattr(db_manager, "_pool", None)
+    monkeypatch.setitem(db_retry.RETRY_CONFIG, "base_delay", 0)
+    return server
@@ -0,0 +1,118 @@
+import pymysql
+
+
+# 테스트용 가짜 MySQL 서버 (매각/회차/점유자 행을 메모리에 보관)
+# drops: 다음 실행(execute)에서 연결을 끊을 횟수, commit_drops: 서버에 커밋한 뒤 응답 전에 연결을 끊을 횟수
+class FakeServer:
+
+    def __init__(self):
+        self.masters = {}  # idx -> 매각 행
+        self.hashes = {}  # idx -> content_hash (중복 방지 모드)
+        self.child_rows = {"rounds": [], "occupants": []}
+        self.next_idx = 1
+        self.drops = 0
+        self.commit_drops = 0
+        self.connections = []
+
+    def connect(self):
+        conn = FakeConnection(self)
+        self.connections.append(conn)
+        return conn
+
+
+# pymysql 처럼 연결이 끊기면 소켓을 닫고(open=False), 이후 호출은 InterfaceError(0, '')
+class FakeConnection:
+
+    def __init__(self, server):
+        self.server = server
+        self.open = True
+        self.commits = 0
+        self._pending = {"masters": {}, "hashes": {}, "rounds": [], "occupants": []}
+
+    def _check(self):
+        if not self.open:
+            raise pymysql.err.InterfaceError(0, '')
+
+    def _drop(self):
+        self.open = False
+        raise pymysql.err.OperationalError(2013, "Lost connection to MySQL server during query")
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self._check()
+        self.server.masters.update(self._pending["masters"])
+        self.server.hashes.update(self._pending["hashes"])
+        self.server.child_rows["rounds"].extend(self._pending["rounds"])
+        self.server.child_rows["occupants"].extend(self._pending["occupants"])
+        self._pending = {"masters": {}, "hashes": {}, "rounds": [], "occupants": []}
+        self.commits += 1
+
+        if self.server.commit_drops > 0:
+            self.server.commit_drops -= 1
+            self._drop()
+
+    def rollback(self):
+        self._check()
+        self._pending = {"masters": {}, "hashes": {}, "rounds": [], "occupants": []}
+
+    def ping(self, reconnect=False):
+        self._check()
+
+    def close(self):
+        self.open = False
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = None
+        self._result = None
+
+    def execute(self, sql, args=None):
+        conn = self.conn
+        conn._check()
+        if conn.server.drops > 0:
+            conn.server.drops -= 1
+            conn._drop()
+
+        if "INSERT INTO tmp_maegak (" in sql:
+            values = list(args)
+            self.lastrowid = conn.server.next_idx
+            for i in range(0, len(values), 10):
+                conn._pending["masters"][conn.server.next_idx] = tuple(values[i:i + 10])
+                conn.server.next_idx += 1
+        elif "SELECT idx FROM tmp_maegak" in sql:
+            saved = {**conn.server.masters, **conn._pending["masters"]}
+            matches = [idx for idx, row in saved.items() if row == tuple(args)]
+            self._result = (max(matches),) if matches else None
+        elif "SELECT idx, content_hash FROM tmp_maegak" in sql:
+            saved = {**conn.server.masters, **conn._pending["masters"]}
+            hashes = {**conn.server.hashes, **conn._pending["hashes"]}
+            matches = [idx for idx, row in saved.items() if (row[0], row[1], row[4]) == tuple(args)]
+            self._result = (matches[0], hashes.get(matches[0])) if matches else None
+        elif "UPDATE tmp_maegak SET content_hash" in sql:
+            conn._pending["hashes"][args[1]] = args[0]
+        elif "auto_increment_increment" in sql:
+            self._result = (1,)
+
+    def executemany(self, sql, args):
+        self.execute("")
+        key = "rounds" if "tmp_maegak_rounds" in sql else "occupants"
+        self.conn._pending[key].extend(args)
+
+    def fetchone(self):
+        return self._result
+
+
+def make_document(case_no="2024타경1"):
+    return {
+        "case_no": case_no, "item_no": "1", "priority_date": "", "dividend_end_date": "",
+        "document_date": "", "tenant_note": "", "surviving_rights": "", "surface_right_summary": "",
+        "general_note": "", "pdf_path": f"{case_no}.pdf",
+        "auction_rounds": [{"round_no": "1회", "auction_date": "2024.01.01", "min_bid_price": "1,000",
+                            "bid_deposit": "100"}],
+        "occupants": {},
+    }
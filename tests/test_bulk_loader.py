@@ -0,0 +1,38 @@
+import os
+
+from bulk_loader import StagingWriter, load_staging, read_staging_keys, save_staging_meta
+from fake_mysql import make_document
+
+
+# close() 없이 종료(SIGKILL)된 뒤 다시 열면 이미 기록된 parent_idx 다음부터 발급
+def test_reopen_after_kill_continues_keys(tmp_path):
+    staging_dir = str(tmp_path)
+
+    writer = StagingWriter(staging_dir, start_key=100)
+    writer.submit(make_document("A"), None)
+    writer.submit(make_document("B"), None)
+    # 강제 종료: close() 호출 없음, 기록 도중 잘린 줄이 남음
+    with open(os.path.join(staging_dir, "tmp_maegak.tsv"), "a", encoding="utf-8") as f:
+        f.write("102\t잘린")
+
+    writer = StagingWriter(staging_dir, start_key=100)
+    writer.submit(make_document("C"), None)
+    writer.close()
+
+    assert read_staging_keys(staging_dir, "tmp_maegak") == [100, 101, 102]
+    assert read_staging_keys(staging_dir, "tmp_maegak_rounds") == [100, 101, 102]
+
+
+# parent_idx 가 중복된 스테이징 파일은 DB 연결 전에 적재 거부
+def test_load_refuses_duplicate_keys(tmp_path):
+    staging_dir = str(tmp_path)
+    for table in ("tmp_maegak", "tmp_maegak_rounds", "tmp_maegak_occupants"):
+        open(os.path.join(staging_dir, f"{table}.tsv"), "w").close()
+    with open(os.path.join(staging_dir, "tmp_maegak.tsv"), "w", encoding="utf-8") as f:
+        f.write("100\tA\n101\tB\n100\tC\n")
+    save_staging_meta(staging_dir, {"first_key": 100, "next_key": 101})
+
+    success, msg = load_staging(staging_dir)
+
+    assert not success
+    assert "중복 1건" in msg
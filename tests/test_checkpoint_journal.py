@@ -0,0 +1,12 @@
+from checkpoint_journal import open_journal, load_completed_entries, record_outcome, STATUS_DONE, STATUS_STAGED
+
+
+# 대량 적재 모드에서 스테이징만 된 문서는 일반 실행에서 건너뛰지 않음
+def test_staged_entries_are_not_done(tmp_path):
+    journal = open_journal(str(tmp_path / "journal.db"))
+    record_outcome(journal, "a.pdf", True, parent_idx=1)
+    record_outcome(journal, "b.pdf", True, parent_idx=100, success_status=STATUS_STAGED)
+
+    assert set(load_completed_entries(journal)) == {"a.pdf"}
+    assert set(load_completed_entries(journal, (STATUS_DONE, STATUS_STAGED))) == {"a.pdf", "b.pdf"}
+    journal.close()
@@ -0,0 +1,29 @@
+import pymysql
+import pytest
+
+import db_manager
+from fake_mysql import make_document
+from module_test_parsing import save_to_db, write_document
+
+
+# 끊긴 연결은 풀에 돌려놓지 않고 버림 → 재시도와 다음 저장은 새 연결 사용
+def test_dropped_connection_is_discarded(server):
+    server.drops = 1
+
+    assert save_to_db(make_document("A"), upsert=False) == (True, 1)
+    assert save_to_db(make_document("B"), upsert=False) == (True, 2)
+
+    stats = db_manager.pop_pool_stats()
+    assert stats["discarded"] == 1
+    assert stats["misses"] == 2
+    assert len(server.connections) == 2
+    assert server.connections[1].commits == 2
+
+
+# 끊긴 연결의 롤백 실패(InterfaceError)가 원래 에러(2013)를 가리지 않음
+def test_rollback_failure_keeps_original_error(server):
+    server.drops = 1
+
+    with pytest.raises(pymysql.err.OperationalError) as exc_info:
+        write_document(make_document(), False)
+    assert exc_info.value.args[0] == 2013
@@ -0,0 +1,34 @@
+from db_batch_writer import BatchWriter
+from fake_mysql import make_document
+from module_test_parsing import save_to_db
+
+
+# 커밋 후 응답 전에 연결이 끊겨도 재시도에서 같은 문서를 다시 추가하지 않음
+def test_commit_lost_after_server_commit_is_not_duplicated(server):
+    server.commit_drops = 1
+
+    assert save_to_db(make_document(), upsert=False) == (True, 1)
+    assert list(server.masters) == [1]
+    assert len(server.child_rows["rounds"]) == 1
+
+
+# 커밋 전에 끊긴 경우는 그대로 다시 저장
+def test_connection_lost_before_commit_is_retried(server):
+    server.drops = 1
+
+    assert save_to_db(make_document(), upsert=False) == (True, 1)
+    assert list(server.masters) == [1]
+
+
+# 묶음 저장도 커밋 후 끊기면 저장된 문서를 확인하고 다시 추가하지 않음
+def test_batch_commit_lost_is_not_duplicated(server):
+    results = []
+    writer = BatchWriter(lambda context, success, msg: results.append((context, success, msg)), batch_size=3)
+    server.commit_drops = 1
+
+    for case_no in ("A", "B", "C"):
+        writer.add(make_document(case_no), case_no)
+
+    assert results == [("A", True, 1), ("B", True, 2), ("C", True, 3)]
+    assert len(server.masters) == 3
+    assert len(server.child_rows["rounds"]) == 3
@@ -0,0 +1,16 @@
+import time
+
+import error_logger
+
+
+# 다음 에러가 오지 않아도 flush_seconds 가 지나면 파일에 기록
+def test_buffered_record_is_flushed_by_timer(tmp_path, monkeypatch):
+    monkeypatch.setitem(error_logger.ERROR_LOG_CONFIG, "dir", str(tmp_path))
+    monkeypatch.setitem(error_logger.ERROR_LOG_CONFIG, "flush_seconds", 0.1)
+    logger = error_logger.ErrorLogger("A")
+
+    logger.log("sub", "a.pdf", "에러")
+    time.sleep(0.5)
+
+    with open(logger.path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
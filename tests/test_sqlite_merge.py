@@ -0,0 +1,50 @@
+import module_test_parsing
+from fake_mysql import make_document
+from module_test_parsing import build_master_row, build_round_rows, build_occupant_rows, MASTER_INSERT_SQL, \
+    ROUNDS_INSERT_SQL, OCCUPANTS_INSERT_SQL
+from sqlite_sink import open_sqlite_sink, merge_sqlite_to_mysql, to_sqlite_sql
+
+
+def write_shard(path, case_nos):
+    shard = open_sqlite_sink(path)
+    for case_no in case_nos:
+        data = make_document(case_no)
+        cursor = shard.execute(to_sqlite_sql(MASTER_INSERT_SQL), build_master_row(data))
+        shard.executemany(to_sqlite_sql(ROUNDS_INSERT_SQL), build_round_rows(cursor.lastrowid, data['auction_rounds']))
+        shard.executemany(to_sqlite_sql(OCCUPANTS_INSERT_SQL),
+                          build_occupant_rows(cursor.lastrowid, data['occupants']))
+    shard.commit()
+    shard.close()
+
+
+# MySQL 커밋 후 mysql_idx 기록 전에 중단된 병합을 다시 실행해도 같은 문서를 다시 추가하지 않음
+def test_resumed_merge_does_not_duplicate(server, tmp_path):
+    shard_path = str(tmp_path / "shard.db")
+    write_shard(shard_path, ["A", "B", "C"])
+
+    assert merge_sqlite_to_mysql(shard_path, chunk_size=2) == 3
+    # 중단 상황 재현: 마지막 묶음의 mysql_idx 기록이 남지 않음
+    shard = open_sqlite_sink(shard_path)
+    shard.execute("UPDATE tmp_maegak SET mysql_idx = NULL WHERE idx = 3")
+    shard.commit()
+    shard.close()
+
+    assert merge_sqlite_to_mysql(shard_path, chunk_size=2) == 1
+    assert len(server.masters) == 3
+    assert len(server.child_rows["rounds"]) == 3
+
+
+# 중복 방지 모드: 다른 SQLite 파일에 같은 문서가 있으면 병합 시 새로 추가하지 않음
+def test_merge_uses_upsert(server, tmp_path, monkeypatch):
+    monkeypatch.setitem(module_test_parsing.SAVE_CONFIG, "upsert", True)
+    write_shard(str(tmp_path / "a.db"), ["A", "B"])
+    write_shard(str(tmp_path / "b.db"), ["B"])
+
+    merge_sqlite_to_mysql(str(tmp_path / "a.db"))
+    stats = module_test_parsing.pop_upsert_stats()
+    merge_sqlite_to_mysql(str(tmp_path / "b.db"))
+
+    assert stats["inserted"] == 2
+    assert module_test_parsing.pop_upsert_stats()["unchanged"] == 1
+    assert len(server.masters) == 2
+    assert len(server.child_rows["rounds"]) == 2
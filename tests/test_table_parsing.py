@@ -0,0 +1,45 @@
+from module_test_parsing import ParsedTable, get_default_case_data, get_general_notes, get_occupants
+
+
+def occupant_row(name, unit, info_source="현황조사"):
+    return [name, unit, info_source, "주거", "", "", "", "", "", ""]
+
+
+# 빈 칸은 열 종류(모두 None / 일부 None)와 관계없이 "" (이름이 비면 위 행 이름 사용)
+def test_empty_cells_are_blank_in_every_column():
+    all_none = get_occupants([occupant_row(None, "101호"), occupant_row(None, "102호")], "", None, True)
+    assert list(all_none["occupants"]) == [""]
+
+    mixed = get_occupants([occupant_row("홍길동", "101호"), occupant_row(None, "102호")], "", None, True)
+    assert [d["unit"] for d in mixed["occupants"]["홍길동"]] == ["101호", "102호"]
+    assert "nan" not in mixed["occupants"]
+
+
+def test_missing_values_never_become_nan_text():
+    table = ParsedTable([["사건", None, "2024타경1"] + [None] * 7, ["<비고>", "내용", None] + [None] * 7])
+
+    assert "nan" not in " ".join(table.row_texts)
+    assert get_default_case_data(table)["case_no"] == "2024타경1"
+    assert get_general_notes(table, False, False, False, False)["tenant_note"] == "내용"
+
+
+# 점유자 범위가 비어 있는 표 / 이어지는 표의 첫 행만 있는 표
+def test_empty_occupant_block():
+    assert get_occupants([["<비고>"] + [None] * 9, ["x"] * 10], "", None, True) == {"occupants": {}}
+    assert get_occupants([occupant_row("", "101호", info_source="")], "", None, True) == {"occupants": {}}
+
+
+# 머리글로 찾은 열 계획은 같은 칸 수의 다음 표(머리글 없음)에도 사용, 계획이 없으면 빈 행을 만들지 않음
+def test_header_plan_carries_to_next_table():
+    header = ["성명", "점유부분", "정보출처", "점유의권원", "임대차기간", "보증금", "차임", "전입신고", "확정일자",
+              "배당요구", "비고"]
+    first = [header, ["홍길동", "101호", "현황조사", "주거", "", "1,000", "", "2020.01.01", "", "", ""]]
+    second = [["김철수", "102호", "권리신고", "주거", "", "2,000", "", "2021.01.01", "", "", ""]]
+
+    assert get_occupants(second, "", None, True) == {"occupants": {}}
+
+    plans = {}
+    get_occupants(first, "", None, True, plans)
+    occupants = get_occupants(second, "", None, True, plans)["occupants"]
+    assert occupants["김철수"][0]["info_source"] == "권리신고"
+    assert occupants["김철수"][0]["deposit"] == "2,000"